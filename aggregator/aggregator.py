@@ -1,138 +1,212 @@
 import os
-import json
 import numpy as np
 import math
 import glob
 import re
+import time
+import copy
+import traceback
+import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import cycle, repeat
 
-
-from matplotlib import pyplot as plt
-import mplcursors
-from sklearn.cluster import KMeans
-from itertools import cycle
-import matplotlib.ticker as mtick
-
-from aggregator.services.contract import ContractService
-from aggregator.services.input import InputService
-from aggregator.services.output import OutputService
-from aggregator.services.result import ResultService
 from aggregator.config import Config
+from aggregator.context import ExperimentContext
+from aggregator.shared.constants import FUZZING_TYPES
+from aggregator.shared.coverage import CoverageMatrix
+from aggregator.shared.workspace import Workspace
 
 MARKER_HOUR = "==================================="
 MARKER_TIME_FRAME = "===================================TIME_FRAME"
+REPORTS_WALL_TIME_FILE = "reports_wall_time.txt"
 
 linestyles = cycle([ '--'])
 mainlinestyles = cycle(['-'])
 
 class Aggregator():
 
-    def __init__(self) -> None:
-        self._input_service = InputService()
-        self._contract_service = ContractService()
-        self._result_service = ResultService()
-        self._output_service = OutputService()
+    def __init__(self, workers: int = 1, temp_folder: str = ".temp") -> None:
         self._config = Config()
+        self._config.workers = workers
+        self._config.temp_folder = temp_folder
+        self._context = ExperimentContext(self._config)
+        self._input_service = self._context.input_service
+        self._contract_service = self._context.contract_service
+        self._cluster_service = self._context.cluster_service
+        self._result_service = self._context.result_service
+        self._metrics_service = self._context.metrics_service
+        self._output_service = self._context.output_service
 
     def generate_report(self, results_folder: str, inputs_file: str):
-        self._input_service.extract_inputs(inputs_file)
-        contracts = self._contract_service.list_contracts_from_contract_list(False)
-        self._result_service.extract_results(results_folder)
-        self._output_service.write_report(results_folder, contracts, False, False)
+        self._context.load(results_folder, inputs_file, False)
+        self._context.write_report(False)
 
     def generate_report_not_labeled(self, results_folder: str, inputs_file: str):
-        self._input_service.extract_inputs(inputs_file)
-        contracts = self._contract_service.list_contracts_from_contract_list(False)
-        self._result_service.extract_results(results_folder)
-        self._output_service.write_report(results_folder, contracts, False, True)
+        self._context.load(results_folder, inputs_file, False)
+        self._context.write_report(True)
 
     def generate_report_smartian(self, results_folder: str, inputs_file: str):
-        self._input_service.extract_inputs(inputs_file)
-        contracts = self._contract_service.list_contracts_from_contract_list(True)
-        self._result_service.extract_results(results_folder)
-        self._result_service.convert_results_to_smartian(results_folder)
-        self._output_service.write_report(results_folder, contracts, True, False)
-
-    def show_kmeans(self, cluster_number: int = 3):
-        inputs_file_folder = os.path.join(
-            self._config.temp_folder, self._config.inputs_folder)
-        inputs_file = os.path.join(inputs_file_folder, "inputs.json")
-
-        with open(inputs_file, 'r', encoding='utf-8') as f:
-            inputs = json.load(f)
-            dataset = np.array([[input['numberOfBranches'], sum(
-                input['numberOfCriticalInstructions'].values())] for input in inputs])
-
-            kmeans = KMeans(n_clusters=cluster_number, random_state=42, 
-                            n_init=10, max_iter=100)
-            kmeans.fit(dataset)
-
-            plt.scatter(dataset[:, 0], dataset[:, 1], c=kmeans.labels_)
-            plt.title('Clusterização dos Contratos')
-            plt.xlabel('Número de Arestas')
-            plt.xlim(-50, 450)
-            plt.ylabel('Número de Instruções Críticas')
-            plt.ylim(-5, 20)
-            plt.grid()
-            plt.show()
-
-    def show_elbow_method(self):
-        inputs_file_folder = os.path.join(
-            self._config.temp_folder, self._config.inputs_folder)
-        inputs_file = os.path.join(inputs_file_folder, "inputs.json")
-
-        with open(inputs_file, 'r', encoding='utf-8') as f:
-            inputs = json.load(f)
-            dataset = np.array([[input['numberOfBranches'], sum(
-                input['numberOfCriticalInstructions'].values())] for input in inputs])
-
-            inertias = []
-
-            for i in range(1, 11):
-                kmeans = KMeans(n_clusters=i, n_init=10)
-                kmeans.fit(dataset)
-                inertias.append(kmeans.inertia_)
-
-            plt.plot(range(1, 11), inertias, marker='o')
-            plt.title('Método Elbow')
-            plt.xlabel('Número de Clusters')
-            plt.ylabel('Inercia')
-            plt.show()
+        self._context.load(results_folder, inputs_file, True)
+        self._context.write_report(False)
+
+    def generate_all_reports(
+        self,
+        inputs_file: str,
+        pattern: str = 'experiment_*',
+        smartian: bool = False,
+        not_labeled: bool = False,
+    ):
+        self._context.load_inputs(inputs_file, smartian)
+        results_folders = sorted(
+            os.path.basename(x) for x in glob.glob(os.path.join(self._config.results_folder, pattern))
+            if os.path.isdir(x))
+        if len(results_folders) == 0:
+            print(f"no experiment folder matches {pattern} in {self._config.results_folder}")
+            return
+
+        start = time.perf_counter()
+        workers = min(self._config.workers, len(results_folders))
+        if workers > 1:
+            # every worker process reads one experiment at a time, on its own
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_reports_worker,
+                initargs=(self._config, inputs_file, smartian),
+            ) as executor:
+                wall_times = list(executor.map(_generate_report_in_worker, results_folders, repeat(not_labeled)))
+        else:
+            wall_times = [_generate_report(self._context, x, not_labeled) for x in results_folders]
+        total_wall_time = time.perf_counter() - start
+
+        lines = ['REPORTS WALL TIME', '-' * 50]
+        for results_folder, wall_time, error in wall_times:
+            if error is None:
+                lines.append(f"{results_folder:30}: {wall_time:8.2f} s")
+            else:
+                print(f"the report of {results_folder} failed:\n{error}")
+                lines.append(f"{results_folder:30}: {wall_time:8.2f} s (failed: {error.splitlines()[-1]})")
+        lines += ['-' * 50, f"{'TOTAL':30}: {total_wall_time:8.2f} s"]
+        with Workspace(self._config.temp_folder) as workspace:
+            with open(os.path.join(workspace.path, REPORTS_WALL_TIME_FILE), "wt", encoding="utf-8") as f:
+                for line in lines:
+                    print(line)
+                    f.write(line + '\n')
+            workspace.publish(self._config.results_folder)
+
+    def compile(self, results_folder: str):
+        compiled_results_folder = self._result_service.compile_results(results_folder)
+        print(f"compiled results written to {compiled_results_folder}")
+
+    def summarize(self, results_folder: str):
+        self._result_service.load_results(results_folder)
+        summary_file = self._metrics_service.write_summary(results_folder)
+        print(f"summary written to {summary_file}")
+
+    def merge(self, output_folder: str, inputs_file: str, *summaries, smartian: bool = False, not_labeled: bool = False):
+        self._context.load_inputs(inputs_file, smartian)
+        summary_files = [self._metrics_service.get_summary_file(x) for x in summaries]
+        skipped_files = self._output_service.write_merged_report(
+            output_folder, self._context.contracts, summary_files, smartian, not_labeled)
+        for summary_file, merged_file in skipped_files.items():
+            print(f"skipped {summary_file}, its results were already merged from {merged_file}")
+
+    def show_kmeans(self, inputs_file: str, cluster_number: int = 3):
+        from matplotlib import pyplot as plt
+
+        self._input_service.load_inputs(inputs_file)
+
+        _, dataset = self._cluster_service.get_features()
+        clustering = self._cluster_service.get_clustering(cluster_number)
+
+        plt.scatter(dataset[:, 0], dataset[:, 1], c=clustering.labels)
+        plt.title('Clusterização dos Contratos')
+        plt.xlabel('Número de Arestas')
+        plt.xlim(-50, 450)
+        plt.ylabel('Número de Instruções Críticas')
+        plt.ylim(-5, 20)
+        plt.grid()
+        plt.show()
+
+    def show_elbow_method(self, inputs_file: str):
+        from matplotlib import pyplot as plt
+
+        self._input_service.load_inputs(inputs_file)
+
+        inertias = [x.inertia for x in self._cluster_service.sweep(list(range(1, 11)))]
+
+        plt.plot(range(1, 11), inertias, marker='o')
+        plt.title('Método Elbow')
+        plt.xlabel('Número de Clusters')
+        plt.ylabel('Inercia')
+        plt.show()
+
+    def cluster_sweep(self, inputs_file: str, max_clusters: int = 10, output_folder: str = None):
+        from matplotlib.figure import Figure
+
+        self._input_service.load_inputs(inputs_file)
+        cluster_numbers = list(range(1, max_clusters + 1))
+        clusterings = self._cluster_service.sweep(cluster_numbers)
+        inertias = [x.inertia for x in clusterings]
+        silhouettes = [x.silhouette for x in clusterings]
+        scored = [(silhouette, k) for k, silhouette in zip(cluster_numbers, silhouettes) if silhouette is not None]
+        best_cluster_number = max(scored)[1] if scored else None
+
+        for k, inertia, silhouette in zip(cluster_numbers, inertias, silhouettes):
+            silhouette_text = "-" if silhouette is None else f"{silhouette:.3f}"
+            print(f"{k:2} clusters: inertia = {inertia:14.2f}, silhouette = {silhouette_text}")
+        print(f"best silhouette: {best_cluster_number} clusters")
+
+        figure = Figure(figsize=(10, 4))
+        inertia_axes, silhouette_axes = figure.subplots(1, 2)
+        inertia_axes.plot(cluster_numbers, inertias, marker='o')
+        inertia_axes.set_title('Método Elbow')
+        inertia_axes.set_xlabel('Número de Clusters')
+        inertia_axes.set_ylabel('Inercia')
+        silhouette_axes.plot(
+            [k for k, silhouette in zip(cluster_numbers, silhouettes) if silhouette is not None],
+            [silhouette for silhouette in silhouettes if silhouette is not None], marker='o')
+        silhouette_axes.set_title('Silhouette')
+        silhouette_axes.set_xlabel('Número de Clusters')
+        silhouette_axes.set_ylabel('Silhouette')
+        figure.tight_layout()
+
+        if output_folder is None:
+            output_folder = self._config.results_folder
+        output_name = f"cluster-sweep-{os.path.splitext(os.path.basename(inputs_file))[0]}"
+        with Workspace(self._config.temp_folder) as workspace:
+            figure.savefig(os.path.join(workspace.path, f"{output_name}.png"))
+            with open(os.path.join(workspace.path, f"{output_name}.json"), 'w') as file:
+                json.dump({
+                    "inputs": inputs_file,
+                    "clusterings": [
+                        {"clusters": k, "inertia": inertia, "silhouette": silhouette}
+                        for k, inertia, silhouette in zip(cluster_numbers, inertias, silhouettes)
+                    ],
+                    "best_silhouette": best_cluster_number,
+                }, file, indent=2)
+            workspace.publish(output_folder)
+        print(f"cluster sweep written to {os.path.join(output_folder, output_name)}.png and .json")
 
     def inputs_stats_smartian(self, inputs_file: str):
-        self._input_service.extract_inputs(inputs_file)
+        self._input_service.load_inputs(inputs_file)
         contracts = self._contract_service.list_contracts_from_contract_list(True)
         self._print_all(contracts)
         
     def inputs_stats(self, inputs_file: str):
-        self._input_service.extract_inputs(inputs_file)
+        self._input_service.load_inputs(inputs_file)
         contracts = self._contract_service.list_contracts_from_contract_list(False)
 
         self._print_all(contracts)
 
     def _print_all(self, contracts):
-        vulnerabilities = {}
-        for contract in contracts:
-            for vulnerability in contract['vulnerabilities']:
-                vulnerabilities[vulnerability] = vulnerabilities.get(
-                    vulnerability, 0) + 1
-                
-                
-        inputs_file_folder = os.path.join(
-            self._config.temp_folder, self._config.inputs_folder)
-        inputs_file = os.path.join(inputs_file_folder, "inputs.json")
-                
+        vulnerabilities = {
+            vulnerability: contracts.get_vulnerability_count(vulnerability)
+            for vulnerability in contracts.vulnerabilities
+        }
+
         clusters = {}
-        with open(inputs_file, 'r', encoding='utf-8') as f:
-            inputs = json.load(f)
-            dataset = np.array([[input['numberOfBranches'], sum(
-                input['numberOfCriticalInstructions'].values())] for input in inputs])
-            kmeans = KMeans(n_clusters=3, init='random',
-                            n_init=10, max_iter=100)
-            kmeans.fit(dataset)
-
-            letters = ['A', 'B', 'C']
-            for i in kmeans.labels_:
-                clusters[letters[i]] = clusters.get(letters[i], 0) + 1
+        for letter in self._cluster_service.get_clustering(3).get_letters():
+            clusters[letter] = clusters.get(letter, 0) + 1
 
         print(f'Número de contratos: {len(contracts)}')
         print("------------------------------")
@@ -300,6 +374,19 @@ class Aggregator():
             print(f"File '{filename}' not found.")
             return None
 
+    def _read_coverage_over_time(self, filename):
+        """returns the minutes and the coverage of a smartian-cov report
+        """
+        loaded_data = self._read_data_after_marker(filename, "00m: 0.0", True)
+        lines = [line for line in loaded_data.split('\n') if line.strip() != ""]
+        all_minutes = []
+        all_values = []
+        for line in lines:
+            minute, value = map(float, line.split('m:'))
+            all_minutes.append(minute)
+            all_values.append(value)
+        return all_minutes, all_values
+
     def smartian_b2_alarms_avg(self, results_folder: str, fuzz_type: str): 
         file_list = [file for file in glob.glob(os.path.join(results_folder, '')+"smartian-alarms-" + fuzz_type + '*.txt' )]
 
@@ -363,27 +450,19 @@ class Aggregator():
         file_list = [file for file in glob.glob(os.path.join(results_folder, '')+"smartian-cov-" + fuzz_type + '*.txt' )]
         
         if len(file_list) != 0:
-            sum_values = []
-            for file_path in file_list:
-                loaded_data = self._read_data_after_marker(file_path, "00m: 0.0", True)
-                lines = [line for line in loaded_data.split('\n') if line.strip() != ""]    
-                all_minutes = []
-                all_values = []
-                for line in lines:
-                    minute, value = map(float, line.split('m:'))
-                    all_minutes.append(int(minute))
-                    all_values.append(value)
-                sum_values.append(all_values)
-                
-            averages = [sum(row) / len(row) for row in zip(*sum_values)]
+            coverage_matrix = CoverageMatrix.from_series(
+                [self._read_coverage_over_time(file_path) for file_path in file_list])
             print("===================================")
-            for i, avg in enumerate(averages, start=0):
-                print(f"{all_minutes[i]:02d}m: {avg}")
+            for minute, avg in zip(coverage_matrix.grid.tolist(), coverage_matrix.mean().tolist()):
+                print(f"{int(minute):02d}m: {avg}")
         else:
             print("Invalid directory path.")
             return
 
     def plot_smartian_b2_bugs_found_avg(self, results_folder: str): 
+        from matplotlib import pyplot as plt
+        import mplcursors
+
         if os.path.isdir(results_folder):
             file_list = [os.path.join(results_folder, file) for file in os.listdir(results_folder) if os.path.isfile(os.path.join(results_folder, file))]
 
@@ -416,6 +495,9 @@ class Aggregator():
         plt.show()
 
     def plot_smartian_b2_bugs_found(self, results_folder: str): 
+        from matplotlib import pyplot as plt
+        import mplcursors
+
         if os.path.isdir(results_folder):
             file_list = [os.path.join(results_folder, file) for file in os.listdir(results_folder) if os.path.isfile(os.path.join(results_folder, file))]
 
@@ -446,6 +528,9 @@ class Aggregator():
         plt.show()
         
     def plot_smartian_b2_instruction_coverage(self, results_folder: str): 
+        from matplotlib import pyplot as plt
+        import mplcursors
+
         if os.path.isdir(results_folder):
             file_list = [os.path.join(results_folder, file) for file in os.listdir(results_folder) if os.path.isfile(os.path.join(results_folder, file))]
 
@@ -477,26 +562,20 @@ class Aggregator():
         plt.show()
         
     def plot_smartian_b2_instruction_coverage_avg(self, results_folder: str): 
+        from matplotlib import pyplot as plt
+        import mplcursors
+
         if os.path.isdir(results_folder):
             file_list = [os.path.join(results_folder, file) for file in os.listdir(results_folder) if os.path.isfile(os.path.join(results_folder, file))]
 
-            sum_values = []
-            for file_path in file_list:
-                loaded_data = self._read_data_after_marker(file_path, "00m: 0.0", True)
-                lines = [line for line in loaded_data.split('\n') if line.strip() != ""]
-                all_minutes = []
-                all_values = []
-                for line in lines:
-                    minute, value = map(float, line.split('m:'))
-                    all_minutes.append(minute)
-                    all_values.append(value)
-                sum_values.append(all_values)
-                
-            averages = [sum(row) / len(row) for row in zip(*sum_values)]
-            means = [np.median(row) for row in zip(*sum_values)]
-            plt.plot(all_minutes, all_values, linestyle=next(linestyles), label=os.path.basename(file_path), linewidth=2.5)
-            for i, avg in enumerate(averages, start=0):
-                print(f"{int(all_minutes[i]):02}m: {avg}")
+            coverage_matrix = CoverageMatrix.from_series(
+                [self._read_coverage_over_time(file_path) for file_path in file_list])
+            averages = coverage_matrix.mean()
+            low, high = coverage_matrix.band()
+            plt.plot(coverage_matrix.grid, averages, linestyle=next(linestyles), label="Avg of " + results_folder, linewidth=2.5)
+            plt.fill_between(coverage_matrix.grid, low, high, alpha=0.2, label="25%-75% of " + results_folder)
+            for minute, avg in zip(coverage_matrix.grid.tolist(), averages.tolist()):
+                print(f"{int(minute):02}m: {avg}")
         else:
             print("Invalid directory path.")
             return
@@ -508,11 +587,44 @@ class Aggregator():
         plt.grid(True)
         plt.show()        
 
+    def plot_instruction_coverage_bands(
+        self,
+        results_folder: str,
+        time_frame_in_seconds: int = 60,
+        upper_limit_in_seconds: int = 3600,
+        low: float = 0.25,
+        high: float = 0.75,
+    ):
+        from matplotlib import pyplot as plt
+
+        self._result_service.load_results(results_folder)
+        for strategy in FUZZING_TYPES:
+            coverage_matrix = self._result_service.get_coverage_matrix(
+                strategy, time_frame_in_seconds, upper_limit_in_seconds)
+            if len(coverage_matrix.values) == 0:
+                continue
+            minutes = coverage_matrix.grid / 60
+            low_curve, high_curve = coverage_matrix.band(low, high)
+            line, = plt.plot(minutes, coverage_matrix.median(), label=f"{strategy} (median)", linewidth=2.5)
+            plt.fill_between(minutes, low_curve, high_curve, color=line.get_color(), alpha=0.2,
+                             label=f"{strategy} ({low:.0%}-{high:.0%})")
+            print(f"{strategy:25}: {len(coverage_matrix.values)} executions, "
+                  f"final median coverage = {coverage_matrix.median()[-1]:.2f}")
+
+        plt.legend(loc='lower right')
+        plt.xlabel('Time (min.)')
+        plt.ylabel('Instruction Coverage')
+        plt.grid(True)
+        plt.show()
+
     def plot_max_coverage_boxplot(self,results_folder: str, inputs_file: str):
+        from matplotlib import pyplot as plt
+        import mplcursors
 
-        self._input_service.extract_inputs(inputs_file)
+
+        self._input_service.load_inputs(inputs_file)
         contracts = self._contract_service.list_contracts_from_contract_list(True)
-        self._result_service.extract_results(results_folder)
+        self._result_service.load_results(results_folder)
         (average_blackbox, average_greybox, average_directed_greybox), _ = self._output_service.get_max_coverage_result(contracts)
 
         data = [average_blackbox, average_greybox, average_directed_greybox]
@@ -545,10 +657,14 @@ class Aggregator():
         plt.show()
 
     def plot_max_coverage_bar(self,results_folder: str, inputs_file: str):
+        from matplotlib import pyplot as plt
+        import matplotlib.ticker as mtick
+        import mplcursors
+
 
-        self._input_service.extract_inputs(inputs_file)
+        self._input_service.load_inputs(inputs_file)
         contracts = self._contract_service.list_contracts_from_contract_list(True)
-        self._result_service.extract_results(results_folder)
+        self._result_service.load_results(results_folder)
         _, (average_blackbox, average_greybox, average_directed_greybox) = self._output_service.get_max_coverage_result(contracts)
 
         methods = ['']
@@ -571,3 +687,33 @@ class Aggregator():
         plt.tight_layout()
 
         plt.show()
+
+
+_worker_context = None
+
+
+def _init_reports_worker(config: Config, inputs_file: str, for_smartian: bool):
+    global _worker_context
+    # the experiments already run in parallel, so each one is read serially
+    config = copy.copy(config)
+    config.workers = 1
+    _worker_context = ExperimentContext(config)
+    _worker_context.load_inputs(inputs_file, for_smartian)
+
+
+def _generate_report_in_worker(results_folder: str, not_labeled: bool):
+    return _generate_report(_worker_context, results_folder, not_labeled)
+
+
+def _generate_report(context: ExperimentContext, results_folder: str, not_labeled: bool):
+    """writes the report of an experiment folder with the inputs of the
+    context, returning its wall time and the traceback of the error which
+    stopped it, if any
+    """
+    start = time.perf_counter()
+    try:
+        context.load_results(results_folder)
+        context.write_report(not_labeled)
+    except Exception:
+        return results_folder, time.perf_counter() - start, traceback.format_exc()
+    return results_folder, time.perf_counter() - start, None
@@ -0,0 +1,58 @@
+"""
+this module contains the context of an experiment aggregation
+"""
+from aggregator.config import Config
+from aggregator.services.cluster import ClusterService
+from aggregator.services.contract import ContractService
+from aggregator.services.input import InputService
+from aggregator.services.metrics import MetricsService
+from aggregator.services.output import OutputService
+from aggregator.services.result import ResultService
+
+
+class ExperimentContext():
+    """state of an experiment aggregation: its configuration, the loaded inputs
+    and results, the contracts and the vulnerability taxonomy, together with
+    the services bound to them. Contexts share nothing, so several
+    experiments can be loaded side by side and aggregated concurrently
+    """
+
+    def __init__(self, config: Config = None) -> None:
+        self.config = config if config is not None else Config()
+        self.results_folder_name = None
+        self.contracts = None
+        self.for_smartian = False
+
+        self.input_service = InputService(self)
+        self.contract_service = ContractService(self)
+        self.cluster_service = ClusterService(self)
+        self.result_service = ResultService(self)
+        self.metrics_service = MetricsService(self)
+        self.output_service = OutputService(self)
+
+    def load(self, results_folder_name: str, inputs_file: str, for_smartian: bool):
+        """loads the inputs and the results of the experiment folder, the
+        detected weaknesses are presented in the smartian standard when requested
+        """
+        self.load_inputs(inputs_file, for_smartian)
+        self.load_results(results_folder_name)
+
+    def load_inputs(self, inputs_file: str, for_smartian: bool):
+        """loads the inputs zip and lists its contracts in the requested taxonomy
+        """
+        self.input_service.load_inputs(inputs_file)
+        self.contracts = self.contract_service.list_contracts_from_contract_list(for_smartian)
+        self.for_smartian = for_smartian
+
+    def load_results(self, results_folder_name: str):
+        """loads the results of the experiment folder for the contracts already listed
+        """
+        self.result_service.load_results(results_folder_name)
+        if self.for_smartian:
+            self.result_service.convert_results_to_smartian(results_folder_name)
+        self.results_folder_name = results_folder_name
+
+    def write_report(self, not_labeled: bool):
+        """writes the report of the loaded experiment into its results folder
+        """
+        self.output_service.write_report(self.results_folder_name, self.contracts, self.for_smartian, not_labeled)
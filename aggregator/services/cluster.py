@@ -0,0 +1,164 @@
+"""
+this module contains the clustering of the contracts by size, shared by the
+reports and the clustering plots
+"""
+import hashlib
+import json
+import os
+import string
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from aggregator.shared.workspace import Workspace
+
+CLUSTERS_FILE_SUFFIX = ".clusters.json"
+CLUSTERS_VERSION = 1
+CLUSTERING_SEED = 42
+CLUSTERING_FEATURES = ["numberOfBranches", "numberOfCriticalInstructions"]
+
+
+class Clustering():
+    """kmeans clustering of the contracts of an inputs zip. The clusters are
+    numbered by their centroid, from the smallest contracts to the largest
+    """
+
+    def __init__(self, contract_names: list, labels: list, inertia: float, silhouette: float = None) -> None:
+        self.contract_names = contract_names
+        self.labels = np.asarray(labels, dtype=np.int64)
+        self.inertia = inertia
+        self.silhouette = silhouette
+
+    def get_letters(self) -> list:
+        """returns the letter of the cluster of every contract, A being the first cluster
+        """
+        return [string.ascii_uppercase[label] for label in self.labels.tolist()]
+
+
+class ClusterService():
+    """service that clusters the contracts of the loaded inputs by their number
+    of branches and critical instructions. The clusterings are computed once
+    per feature matrix and number of clusters, with a fixed seed, and stored
+    next to the inputs zip
+    """
+
+    def __init__(self, context) -> None:
+        self._config = context.config
+        self._input_service = context.input_service
+        self._inputs_archive = None
+        self._features = None
+        self._clusters = None
+
+    def get_features(self):
+        """returns the contract names and their [number of branches, number of
+        critical instructions] matrix
+        """
+        self._load_clusters()
+        return self._features
+
+    def get_clustering(self, cluster_number: int = 3) -> Clustering:
+        """returns the clustering of the contracts in the number of clusters
+        """
+        return self.sweep([cluster_number])[0]
+
+    def sweep(self, cluster_numbers: list) -> list:
+        """returns the clusterings of the contracts in each number of clusters.
+        The ones not computed yet are fitted in parallel worker processes, up
+        to the configured number of workers
+        """
+        clusters = self._load_clusters()
+        missing_cluster_numbers = [x for x in cluster_numbers if str(x) not in clusters["clusterings"]]
+        if len(missing_cluster_numbers) > 0:
+            _, dataset = self._features
+            workers = min(self._config.workers, len(missing_cluster_numbers))
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    fits = list(executor.map(_fit, repeat(dataset), missing_cluster_numbers))
+            else:
+                fits = [_fit(dataset, x) for x in missing_cluster_numbers]
+            for cluster_number, (labels, inertia, silhouette) in zip(missing_cluster_numbers, fits):
+                clusters["clusterings"][str(cluster_number)] = {
+                    "labels": labels.tolist(), "inertia": inertia, "silhouette": silhouette}
+            self._save_clusters(clusters)
+
+        return [
+            Clustering(clusters["contracts"], **clusters["clusterings"][str(cluster_number)])
+            for cluster_number in cluster_numbers
+        ]
+
+    def _load_clusters(self) -> map:
+        """returns the clusterings of the loaded inputs, from memory or from the
+        clusters file when it was computed from the same features
+        """
+        inputs_archive = self._input_service.get_inputs_archive()
+        if self._inputs_archive is inputs_archive:
+            return self._clusters
+
+        features = self._input_service.get_features()
+        contract_names = features.names
+        dataset = features.get_matrix(CLUSTERING_FEATURES)
+        features_digest = _features_digest(contract_names, dataset)
+
+        clusters = None
+        clusters_file_path = self._get_clusters_file_path(inputs_archive.path)
+        if os.path.isfile(clusters_file_path):
+            with open(clusters_file_path, 'r') as file:
+                clusters = json.load(file)
+            if clusters.get("version") != CLUSTERS_VERSION or clusters.get("features") != features_digest:
+                clusters = None
+        if clusters is None:
+            clusters = {
+                "version": CLUSTERS_VERSION, "features": features_digest,
+                "contracts": contract_names, "clusterings": {}}
+
+        self._inputs_archive = inputs_archive
+        self._features = (contract_names, dataset)
+        self._clusters = clusters
+        return clusters
+
+    def _save_clusters(self, clusters: map):
+        clusters_file_path = self._get_clusters_file_path(self._inputs_archive.path)
+        with Workspace(self._config.temp_folder) as workspace:
+            with open(os.path.join(workspace.path, os.path.basename(clusters_file_path)), 'w') as file:
+                json.dump(clusters, file)
+            workspace.publish(os.path.dirname(clusters_file_path))
+
+    def _get_clusters_file_path(self, inputs_zip_path: str) -> str:
+        return os.path.splitext(inputs_zip_path)[0] + CLUSTERS_FILE_SUFFIX
+
+
+def _features_digest(contract_names: list, dataset) -> str:
+    digest = hashlib.sha256(json.dumps(contract_names).encode("utf-8"))
+    digest.update(np.ascontiguousarray(dataset, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def _fit(dataset, cluster_number: int):
+    """fits kmeans with the fixed seed and numbers the clusters by their
+    centroid, so the same inputs always get the same cluster letters. The
+    silhouette score is None when there are less than 2 clusters or as many
+    clusters as contracts
+    """
+    from sklearn.cluster import KMeans
+    from sklearn.metrics import silhouette_score
+
+    kmeans = KMeans(
+        n_clusters=cluster_number,
+        init='random',
+        n_init=10,
+        max_iter=100,
+        random_state=CLUSTERING_SEED,
+    )
+    kmeans.fit(dataset)
+
+    centers = kmeans.cluster_centers_
+    order = np.lexsort((centers[:, 1], centers[:, 0]))
+    labels_by_cluster = np.empty(cluster_number, dtype=np.int64)
+    labels_by_cluster[order] = np.arange(cluster_number)
+    labels = labels_by_cluster[kmeans.labels_]
+
+    silhouette = None
+    if 2 <= len(np.unique(labels)) < len(dataset):
+        silhouette = float(silhouette_score(dataset, labels))
+    return labels, float(kmeans.inertia_), silhouette
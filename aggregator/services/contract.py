@@ -1,9 +1,6 @@
 import csv
-import os
+import io
 
-from aggregator.config import Config
-from aggregator.shared.exceptions import ContractsNotFoundException
-from aggregator.shared.singleton import SingletonMeta
 from aggregator.shared.utils import *
 
 FILE_COLUMN = 0
@@ -12,36 +9,119 @@ VULNERABILITIES_COLUMN = 2
 LINK_COLUMN = 3
 
 
-class ContractService(metaclass=SingletonMeta):
+class Contract():
+    """a contract of the contracts.csv file and its labeled vulnerabilities
+    """
+    __slots__ = ("file", "name", "vulnerabilities", "link")
+
+    def __init__(self, file: str, name: str = None, vulnerabilities: list = None, link: str = "") -> None:
+        self.file = file
+        self.name = name if name is not None else file
+        self.vulnerabilities = vulnerabilities if vulnerabilities is not None else []
+        self.link = link
+
+    def __repr__(self) -> str:
+        return f"Contract({self.file!r}, {self.name!r}, {self.vulnerabilities!r})"
+
+
+class ContractRegistry():
+    """the contracts of an inputs zip, in the order of contracts.csv, indexed
+    by file, by name and by labeled vulnerability
+    """
+
+    def __init__(self, contracts: list) -> None:
+        self._contracts = list(contracts)
+        self._row_by_file = {}
+        self._row_by_name = {}
+        self._rows_by_vulnerability = {}
+        self._vulnerability_counts = {}
+        for row, contract in enumerate(self._contracts):
+            self._row_by_file.setdefault(contract.file, row)
+            self._row_by_name.setdefault(contract.name, row)
+            for vulnerability in contract.vulnerabilities:
+                rows = self._rows_by_vulnerability.setdefault(vulnerability, [])
+                if len(rows) == 0 or rows[-1] != row:
+                    rows.append(row)
+                self._vulnerability_counts[vulnerability] = self._vulnerability_counts.get(vulnerability, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self._contracts)
+
+    def __iter__(self):
+        return iter(self._contracts)
+
+    def __getitem__(self, row: int) -> Contract:
+        return self._contracts[row]
+
+    @property
+    def vulnerabilities(self) -> list:
+        """returns the labeled vulnerabilities, in the order they first appear
+        """
+        return list(self._rows_by_vulnerability)
+
+    def get_by_file(self, file: str) -> Contract:
+        """returns the first contract in the file, None when there is none
+        """
+        row = self.get_row_by_file(file)
+        return None if row is None else self._contracts[row]
+
+    def get_by_name(self, name: str) -> Contract:
+        """returns the first contract with the name, None when there is none
+        """
+        row = self.get_row(name)
+        return None if row is None else self._contracts[row]
+
+    def get_row(self, name: str) -> int:
+        """returns the row of the first contract with the name, None when there is none
+        """
+        return self._row_by_name.get(name, None)
+
+    def get_row_by_file(self, file: str) -> int:
+        """returns the row of the first contract in the file, None when there is none
+        """
+        return self._row_by_file.get(file, None)
+
+    def get_vulnerability_count(self, vulnerability: str) -> int:
+        """returns how many times the vulnerability is labeled in the contracts
+        """
+        return self._vulnerability_counts.get(vulnerability, 0)
+
+    def get_rows_with_vulnerability(self, vulnerability: str) -> list:
+        """returns the rows of the contracts labeled with the vulnerability
+        """
+        return list(self._rows_by_vulnerability.get(vulnerability, []))
+
+    def with_vulnerability(self, vulnerability: str) -> "ContractRegistry":
+        """returns the contracts labeled with the vulnerability
+        """
+        return self.select(self._rows_by_vulnerability.get(vulnerability, []))
+
+    def select(self, rows) -> "ContractRegistry":
+        """returns the contracts of the rows, in their order
+        """
+        return ContractRegistry([self._contracts[row] for row in rows])
+
+
+class ContractService():
     """sertice that contains operations with the available contracts
     """
 
-    def __init__(self) -> None:
-        self._config = Config()
+    def __init__(self, context) -> None:
+        self._input_service = context.input_service
 
-    def list_contracts_from_contract_list(self, for_smartian: bool) -> list:
+    def list_contracts_from_contract_list(self, for_smartian: bool) -> ContractRegistry:
         """lists the contracts from the contracts.csv file
         """
-        contracts_folder = os.path.join(
-            self._config.temp_folder, self._config.inputs_folder)
-        if not os.path.exists(contracts_folder):
-            raise ContractsNotFoundException(
-                "the contracts were not downloaded yet. Please use the command download_contracts first")
+        inputs_archive = self._input_service.get_inputs_archive()
 
         contracts = []
         map_vul = map_vulnerability_to_smartian_standard if for_smartian else map_vulnerability_to_dogefuzz_standard
-        contracts_csv = os.path.join(contracts_folder, "contracts.csv")
-        with open(contracts_csv, 'r', encoding="utf-8") as file:
-            reader = csv.reader(file)
+        with inputs_archive.open("contracts.csv") as file:
+            reader = csv.reader(io.TextIOWrapper(file, encoding="utf-8"))
             for row in reader:
-                contract = {
-                    "file": row[FILE_COLUMN],
-                    "name": row[NAME_COLUMN],
-                    "vulnerabilities": [x for x in [map_vul(x) for x in row[VULNERABILITIES_COLUMN].split(";")] if x is not None],
-                    "link": row[LINK_COLUMN],                
-                }
+                vulnerabilities = [x for x in [map_vul(x) for x in row[VULNERABILITIES_COLUMN].split(";")] if x is not None]
                 if for_smartian:
-                    contract["vulnerabilities"] =  list(set(contract["vulnerabilities"]))
-                contracts.append(contract)
+                    vulnerabilities = list(set(vulnerabilities))
+                contracts.append(Contract(row[FILE_COLUMN], row[NAME_COLUMN], vulnerabilities, row[LINK_COLUMN]))
 
-        return contracts
+        return ContractRegistry(contracts)
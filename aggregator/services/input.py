@@ -1,33 +1,53 @@
 """
 this module contains the logic of the inputs service
 """
-import os
-import zipfile
-import shutil
-
 from os import path
 
-from aggregator.config import Config
-from aggregator.shared.singleton import SingletonMeta
+from aggregator.shared.archive import ZipArchive
+from aggregator.shared.exceptions import ContractsNotFoundException
+from aggregator.shared.features import ContractFeatures
 
 
-class InputService(metaclass=SingletonMeta):
+class InputService():
 
-    def __init__(self) -> None:
-        self._config = Config()
+    def __init__(self, context) -> None:
+        self._config = context.config
+        self._inputs_archive = None
+        self._features = None
 
-    def extract_inputs(self, inputs_file: str):
+    def load_inputs(self, inputs_file: str):
         """
-        extracts inputs from resources folder
+        opens the inputs zip from resources folder, its members are read
+        straight from the archive
         """
-        inputs_folder = path.join(
-            self._config.temp_folder, self._config.inputs_folder)
         inputs_zip_path = path.join(
             self._config.resources_folder, inputs_file)
 
-        if path.exists(inputs_folder):
-            shutil.rmtree(inputs_folder, ignore_errors=True)
-        os.makedirs(inputs_folder)
+        if self._inputs_archive is not None:
+            self._inputs_archive.close()
+        self._inputs_archive = ZipArchive(inputs_zip_path)
+        self._features = None
 
-        with zipfile.ZipFile(inputs_zip_path, 'r') as zip_file:
-            zip_file.extractall(inputs_folder)
+    def get_inputs_archive(self) -> ZipArchive:
+        """
+        returns the loaded inputs zip
+        """
+        if self._inputs_archive is None:
+            raise ContractsNotFoundException(
+                "the contracts were not loaded yet. Please provide the inputs zip file")
+        return self._inputs_archive
+
+    def read_inputs(self) -> list:
+        """
+        returns the content of the inputs.json file
+        """
+        return self.get_inputs_archive().read_json("inputs.json")
+
+    def get_features(self) -> ContractFeatures:
+        """
+        returns the features of the contracts in the inputs.json file, which
+        is parsed once for the loaded inputs zip
+        """
+        if self._features is None:
+            self._features = ContractFeatures(self.read_inputs())
+        return self._features
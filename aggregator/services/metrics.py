@@ -0,0 +1,627 @@
+"""
+this module contains the metrics engine, which walks the executions of every
+fuzzing strategy once and keeps per contract aggregates used by the reports
+"""
+import json
+import os
+
+import numpy as np
+
+from aggregator.services.contract import Contract, ContractRegistry
+from aggregator.shared.compiled import ExecutionColumns
+from aggregator.shared.constants import FUZZING_TYPES, SUMMARY_FILE, SUMMARY_VERSION
+from aggregator.shared.detections import DetectionRecords
+from aggregator.shared.statistics import RunningStats
+from aggregator.shared.utils import *
+from aggregator.shared.workspace import Workspace
+
+
+class ContractMetrics():
+    """aggregates of the successful executions of a contract for one strategy
+    """
+
+    def __init__(self) -> None:
+        self.execution_count = 0
+        self.max_coverage = RunningStats()
+        self.average_coverage = RunningStats()
+        self.critical_instructions_hits = RunningStats()
+        self.transaction_count = RunningStats()
+        self.hits_by_instruction = {}
+        self.detections = {}
+        self.detected_executions = {}
+        self.weaknesses = DetectionRecords()
+
+    def add_execution(self, execution: dict):
+        """updates the aggregates with a single execution, the aggregates of
+        the fields which were not loaded are left untouched
+        """
+        execution = execution["execution"]
+        total_instructions = execution["totalInstructions"]
+
+        self.execution_count += 1
+        if "maxCoverage" in execution:
+            self.max_coverage.add(execution["maxCoverage"] / total_instructions)
+        if "averageCoverage" in execution:
+            self.average_coverage.add(execution["averageCoverage"] / total_instructions)
+        if "criticalInstructionsHits" in execution:
+            self.critical_instructions_hits.add(execution["criticalInstructionsHits"])
+        if "coverageByTime" in execution:
+            self.transaction_count.add(len(execution["coverageByTime"]["epochs"]))
+
+        if "instructionIndex" in execution:
+            instruction_index = execution["instructionIndex"]
+            for instruction, hits in zip(instruction_index.opcodes, instruction_index.hits_by_opcode.tolist()):
+                self.hits_by_instruction[instruction] = self.hits_by_instruction.get(
+                    instruction, 0) + hits
+
+        if "detectedWeaknesses" in execution:
+            self._add_weaknesses(execution["detectedWeaknesses"], execution.get("timeToWeaknesses", None))
+
+    def add_execution_columns(self, executions: ExecutionColumns):
+        """updates the aggregates with the compiled executions of the contract,
+        computed on their columns at once
+        """
+        fields = executions.fields
+        self.execution_count += len(executions)
+        if "maxCoverage" in fields:
+            self.max_coverage.add_all(executions.column("maxCoverage") / executions.column("totalInstructions"))
+        if "averageCoverage" in fields:
+            self.average_coverage.add_all(
+                executions.column("averageCoverage") / executions.column("totalInstructions"))
+        if "criticalInstructionsHits" in fields:
+            self.critical_instructions_hits.add_all(executions.column("criticalInstructionsHits"))
+        if "coverageByTime" in fields:
+            self.transaction_count.add_all(executions.get_timeline_lengths())
+
+        if "instructionIndex" in fields:
+            opcodes, opcode_hits = executions.get_opcode_hits()
+            for code in np.flatnonzero(opcode_hits.sum(axis=0)).tolist():
+                self.hits_by_instruction[opcodes[code]] = self.hits_by_instruction.get(
+                    opcodes[code], 0) + int(opcode_hits[:, code].sum())
+
+        if "detectedWeaknesses" in fields:
+            names, rows, codes = executions.get_detected_weaknesses()
+            detections = np.bincount(codes, minlength=len(names))
+            detected_executions = np.bincount(np.unique(rows * len(names) + codes) % max(len(names), 1),
+                                              minlength=len(names))
+            for code in np.flatnonzero(detections).tolist():
+                self.detections[names[code]] = self.detections.get(names[code], 0) + int(detections[code])
+                self.detected_executions[names[code]] = self.detected_executions.get(
+                    names[code], 0) + int(detected_executions[code])
+            if "timeToWeaknesses" in fields:
+                # the times are keyed by the weaknesses as reported, which may not be the detected ones
+                time_names, time_offsets, time_codes, times = executions.get_time_to_weaknesses()
+                self.weaknesses.add_codes(
+                    names + time_names,
+                    np.searchsorted(rows, np.arange(len(executions) + 1)), codes,
+                    time_offsets, np.asarray(time_codes, dtype=np.int64) + len(names), times)
+
+    def merge(self, other: "ContractMetrics"):
+        """adds the aggregates of other executions of the contract
+        """
+        self.execution_count += other.execution_count
+        self.max_coverage.merge(other.max_coverage)
+        self.average_coverage.merge(other.average_coverage)
+        self.critical_instructions_hits.merge(other.critical_instructions_hits)
+        self.transaction_count.merge(other.transaction_count)
+        for instruction, hits in other.hits_by_instruction.items():
+            self.hits_by_instruction[instruction] = self.hits_by_instruction.get(instruction, 0) + hits
+        for weakness, detections in other.detections.items():
+            self.detections[weakness] = self.detections.get(weakness, 0) + detections
+        for weakness, detections in other.detected_executions.items():
+            self.detected_executions[weakness] = self.detected_executions.get(weakness, 0) + detections
+        self.weaknesses.extend(other.weaknesses)
+
+    def to_summary(self) -> dict:
+        """returns the aggregates as a json serializable dict
+        """
+        return {
+            "execution_count": self.execution_count,
+            "max_coverage": self.max_coverage.to_dict(),
+            "average_coverage": self.average_coverage.to_dict(),
+            "critical_instructions_hits": self.critical_instructions_hits.to_dict(),
+            "transaction_count": self.transaction_count.to_dict(),
+            "hits_by_instruction": self.hits_by_instruction,
+            "weaknesses": self.weaknesses.to_dict(),
+        }
+
+    @staticmethod
+    def from_summary(summary: dict, for_smartian: bool) -> "ContractMetrics":
+        """returns the aggregates of a dict written by to_summary, the detected
+        weaknesses are mapped to the smartian standard when requested
+        """
+        metrics = ContractMetrics()
+        metrics.execution_count = summary["execution_count"]
+        metrics.max_coverage = RunningStats.from_dict(summary["max_coverage"])
+        metrics.average_coverage = RunningStats.from_dict(summary["average_coverage"])
+        metrics.critical_instructions_hits = RunningStats.from_dict(summary["critical_instructions_hits"])
+        metrics.transaction_count = RunningStats.from_dict(summary["transaction_count"])
+        metrics.hits_by_instruction = dict(summary["hits_by_instruction"])
+        for detected_weaknesses, time_to_weaknesses in DetectionRecords.from_dict(summary["weaknesses"]):
+            if for_smartian:
+                detected_weaknesses = map_weaknesses_to_smartian_standard(detected_weaknesses)
+            metrics._add_weaknesses(detected_weaknesses, time_to_weaknesses)
+        return metrics
+
+    def _add_weaknesses(self, detected_weaknesses: list, time_to_weaknesses: dict):
+        for weakness in detected_weaknesses:
+            self.detections[weakness] = self.detections.get(weakness, 0) + 1
+        for weakness in set(detected_weaknesses):
+            self.detected_executions[weakness] = self.detected_executions.get(weakness, 0) + 1
+        if time_to_weaknesses is not None:
+            self.weaknesses.add(detected_weaknesses, time_to_weaknesses)
+
+
+class MetricsTable():
+    """per contract and per strategy metrics, queried by the report sections
+    """
+
+    def __init__(self) -> None:
+        self._metrics = {}
+
+    def add_executions(self, strategy: str, executions_by_contract_name: map):
+        """aggregates the executions of one strategy
+        """
+        for contract_name, executions in executions_by_contract_name.items():
+            self.add_contract_executions(strategy, contract_name, executions)
+
+    def add_contract_executions(self, strategy: str, contract_name: str, executions):
+        """aggregates the executions of a contract one at a time, replacing
+        any former aggregates of the contract
+        """
+        metrics = ContractMetrics()
+        if isinstance(executions, ExecutionColumns):
+            metrics.add_execution_columns(executions)
+        else:
+            for execution in executions:
+                metrics.add_execution(execution)
+        self._metrics.setdefault(strategy, {})[contract_name] = metrics
+
+    def merge(self, other: "MetricsTable"):
+        """adds the metrics of another table, the metrics of a contract found
+        in both tables are merged
+        """
+        for strategy, metrics_by_contract_name in other._metrics.items():
+            for contract_name, metrics in metrics_by_contract_name.items():
+                self.merge_contract_metrics(strategy, contract_name, metrics)
+
+    def merge_contract_metrics(self, strategy: str, contract_name: str, metrics: ContractMetrics):
+        """adds the metrics of a contract, merging them with the metrics already in the table
+        """
+        metrics_by_contract_name = self._metrics.setdefault(strategy, {})
+        if contract_name not in metrics_by_contract_name:
+            metrics_by_contract_name[contract_name] = metrics
+        else:
+            metrics_by_contract_name[contract_name].merge(metrics)
+
+    def get_contract_names(self, strategy: str) -> list:
+        """returns the names of the contracts with results for the strategy
+        """
+        return list(self._metrics.get(strategy, {}).keys())
+
+    def to_summary(self) -> dict:
+        """returns the metrics as a json serializable dict
+        """
+        return {
+            strategy: {contract_name: metrics.to_summary() for contract_name, metrics in metrics_by_contract_name.items()}
+            for strategy, metrics_by_contract_name in self._metrics.items()
+        }
+
+    @staticmethod
+    def from_summary(summary: dict, for_smartian: bool) -> "MetricsTable":
+        """returns the table of a dict written by to_summary
+        """
+        table = MetricsTable()
+        for strategy, metrics_by_contract_name in summary.items():
+            for contract_name, metrics in metrics_by_contract_name.items():
+                table.merge_contract_metrics(
+                    strategy, contract_name, ContractMetrics.from_summary(metrics, for_smartian))
+        return table
+
+    def get(self, strategy: str, contract_name: str) -> ContractMetrics:
+        """returns the metrics of a contract or None when it has no results
+        """
+        return self._metrics.get(strategy, {}).get(contract_name, None)
+
+    def get_rows(self, strategies: list, contracts: ContractRegistry, instructions: list, vulnerabilities: list):
+        """returns the metrics of the contracts as rows aligned with the contracts list
+        """
+        return MetricsRows.from_table(self, strategies, contracts, instructions, vulnerabilities)
+
+    def get_detection(self, strategy: str, contracts: list, vulnerabilities: list):
+        """returns the detection lines by vulnerability and the first detection times
+        """
+        detection = {}
+        for vulnerability in vulnerabilities:
+            detection[vulnerability] = []
+
+        time_map_list = []
+        time_map = {}
+        for contract in contracts:
+            contract_name = contract.file
+            metrics = self.get(strategy, contract_name)
+
+            for vulnerability in contract.vulnerabilities:
+                long_name = map_vulnerability_smartian_to_long_name(vulnerability)
+                if metrics is None or metrics.execution_count == 0:
+                    detection[vulnerability].append(
+                        "Never found " + long_name + " from " + contract_name)
+                    break
+                for detected_weaknesses, time_to_weaknesses in metrics.weaknesses:
+                    if vulnerability in detected_weaknesses:
+                        filterd_times = {key: value for key, value in time_to_weaknesses.items(
+                        ) if is_smartian_type(vulnerability, key)}
+                        _, min_time = min(filterd_times.items(), key=lambda x: x[1])
+                        detection[vulnerability].append(
+                            "Fully found " + long_name + " from " + contract_name + " [" + str(min_time) + "] sec")
+                        time_map[(contract_name, long_name)] = min_time
+                    else:
+                        detection[vulnerability].append(
+                            "Never found " + long_name + " from " + contract_name)
+        if time_map:
+            time_map_list.append(time_map)
+        return detection, time_map_list
+
+    def get_detection_csv(self, strategy: str, contracts: list) -> list:
+        """returns every (contract, weakness, time) detection
+        """
+        detection = []
+        for contract in contracts:
+            contract_name = contract.file
+            metrics = self.get(strategy, contract_name)
+            if metrics is None:
+                continue
+            for _, time_to_weaknesses in metrics.weaknesses:
+                for weakness, time in time_to_weaknesses.items():
+                    detection.append((contract_name, weakness, str(time)))
+        return detection
+
+
+class MetricsRows():
+    """per contract metrics as numpy arrays aligned with a contract registry,
+    so that subsets of the contracts are selected instead of recomputed
+    """
+
+    def __init__(
+        self,
+        contracts: ContractRegistry,
+        strategies: list,
+        instructions: list,
+        vulnerabilities: list,
+        file_ids,
+        labels,
+        execution_count,
+        max_coverage,
+        average_coverage,
+        hits,
+        max_coverage_stats,
+        average_coverage_stats,
+        transaction_count_stats,
+        instruction_hits,
+        detections,
+        detected_executions,
+    ) -> None:
+        self.contracts = contracts
+        self._strategies = strategies
+        self._instructions = instructions
+        self._vulnerabilities = vulnerabilities
+        self._file_ids = file_ids
+        self._labels = labels
+        self._execution_count = execution_count
+        self._max_coverage = max_coverage
+        self._average_coverage = average_coverage
+        self._hits = hits
+        self._max_coverage_stats = max_coverage_stats
+        self._average_coverage_stats = average_coverage_stats
+        self._transaction_count_stats = transaction_count_stats
+        self._instruction_hits = instruction_hits
+        self._detections = detections
+        self._detected_executions = detected_executions
+
+    @staticmethod
+    def from_table(
+        table: MetricsTable,
+        strategies: list,
+        contracts: ContractRegistry,
+        instructions: list,
+        vulnerabilities: list,
+    ) -> "MetricsRows":
+        """returns the metrics of the table as rows aligned with the contracts
+        """
+        vulnerabilities = list(vulnerabilities)
+        for vulnerability in contracts.vulnerabilities:
+            if vulnerability not in vulnerabilities:
+                vulnerabilities.append(vulnerability)
+
+        files = {}
+        file_ids = np.array(
+            [files.setdefault(contract.file, len(files)) for contract in contracts], dtype=np.int64)
+        labels = np.array(
+            [[contract.vulnerabilities.count(vulnerability) for vulnerability in vulnerabilities]
+             for contract in contracts], dtype=np.int64).reshape(len(contracts), len(vulnerabilities))
+
+        shape = (len(contracts), len(strategies))
+        execution_count = np.zeros(shape, dtype=np.int64)
+        max_coverage = np.full(shape, -1, dtype=np.float64)
+        average_coverage = np.full(shape, -1, dtype=np.float64)
+        hits = np.full(shape, -1, dtype=np.float64)
+        max_coverage_stats = np.empty(shape, dtype=object)
+        average_coverage_stats = np.empty(shape, dtype=object)
+        transaction_count_stats = np.empty(shape, dtype=object)
+        instruction_hits = np.zeros(shape + (len(instructions),), dtype=np.int64)
+        detections = np.zeros(shape + (len(vulnerabilities),), dtype=np.int64)
+        detected_executions = np.zeros(shape + (len(vulnerabilities),), dtype=np.int64)
+
+        for row, contract in enumerate(contracts):
+            for column, strategy in enumerate(strategies):
+                metrics = table.get(strategy, contract.file)
+                if metrics is None:
+                    metrics = ContractMetrics()
+                max_coverage_stats[row, column] = metrics.max_coverage
+                average_coverage_stats[row, column] = metrics.average_coverage
+                transaction_count_stats[row, column] = metrics.transaction_count
+                execution_count[row, column] = metrics.execution_count
+                instruction_hits[row, column] = [
+                    metrics.hits_by_instruction.get(instruction, 0) for instruction in instructions]
+                detections[row, column] = [
+                    metrics.detections.get(vulnerability, 0) for vulnerability in vulnerabilities]
+                detected_executions[row, column] = [
+                    metrics.detected_executions.get(vulnerability, 0) for vulnerability in vulnerabilities]
+                if metrics.execution_count > 0:
+                    max_coverage[row, column] = metrics.max_coverage.mean
+                    average_coverage[row, column] = metrics.average_coverage.mean
+                    hits[row, column] = metrics.critical_instructions_hits.mean
+
+        return MetricsRows(
+            contracts, strategies, instructions, vulnerabilities, file_ids, labels, execution_count,
+            max_coverage, average_coverage, hits, max_coverage_stats, average_coverage_stats,
+            transaction_count_stats, instruction_hits, detections, detected_executions)
+
+    def select(self, selection):
+        """returns the rows picked by a boolean mask or by an array of row indexes
+        """
+        indexes = np.arange(len(self.contracts))[selection]
+        return MetricsRows(
+            self.contracts.select(indexes.tolist()),
+            self._strategies,
+            self._instructions,
+            self._vulnerabilities,
+            self._file_ids[indexes],
+            self._labels[indexes],
+            self._execution_count[indexes],
+            self._max_coverage[indexes],
+            self._average_coverage[indexes],
+            self._hits[indexes],
+            self._max_coverage_stats[indexes],
+            self._average_coverage_stats[indexes],
+            self._transaction_count_stats[indexes],
+            self._instruction_hits[indexes],
+            self._detections[indexes],
+            self._detected_executions[indexes],
+        )
+
+    def get_vulnerability_mask(self, vulnerability: str):
+        """returns the mask of the contracts labeled with a vulnerability
+        """
+        if vulnerability not in self._vulnerabilities:
+            return np.zeros(len(self.contracts), dtype=bool)
+        return self._labels[:, self._vulnerabilities.index(vulnerability)] > 0
+
+    def get_max_coverage(self, strategy: str):
+        """returns the max coverage by contract and its average
+        """
+        return self._get_by_contract(self._max_coverage[:, self._strategies.index(strategy)])
+
+    def get_average_coverage(self, strategy: str):
+        """returns the average coverage by contract and its average
+        """
+        return self._get_by_contract(self._average_coverage[:, self._strategies.index(strategy)])
+
+    def get_max_coverage_deviation(self, strategy: str) -> float:
+        """returns the standard deviation of the max coverage of the executions
+        """
+        return self._get_deviation(self._max_coverage_stats[:, self._strategies.index(strategy)])
+
+    def get_average_coverage_deviation(self, strategy: str) -> float:
+        """returns the standard deviation of the average coverage of the executions
+        """
+        return self._get_deviation(self._average_coverage_stats[:, self._strategies.index(strategy)])
+
+    def get_hits(self, strategy: str):
+        """returns the critical instructions hits by contract and its average
+        """
+        return self._get_by_contract(self._hits[:, self._strategies.index(strategy)])
+
+    def get_transaction_count(self, strategy: str) -> float:
+        """returns the average number of transactions by execution
+        """
+        transaction_count = RunningStats.merge_all(
+            self._transaction_count_stats[:, self._strategies.index(strategy)])
+        if transaction_count.count == 0:
+            return -1
+        return transaction_count.mean
+
+    def get_transaction_count_deviation(self, strategy: str) -> float:
+        """returns the standard deviation of the number of transactions by execution
+        """
+        transaction_count = RunningStats.merge_all(
+            self._transaction_count_stats[:, self._strategies.index(strategy)])
+        if transaction_count.count == 0:
+            return -1
+        return transaction_count.std
+
+    def get_hits_by_instructions(self, strategy: str):
+        """returns the hits by instruction, normalized by the transaction count
+        """
+        hits_sum = self._instruction_hits[:, self._strategies.index(strategy)].sum(axis=0)
+        transactions_count = self.get_transaction_count(strategy)
+
+        hits = {}
+        for index, instruction in enumerate(self._instructions):
+            hits[instruction] = int(hits_sum[index]) / transactions_count
+
+        if len(hits) == 0:
+            return (hits, -1)
+        return (hits, sum(hits.values()) / len(hits))
+
+    def get_vulnerabilities_count(self) -> dict:
+        """returns the number of labeled contracts by vulnerability
+        """
+        counts = self._labels.sum(axis=0)
+        return {vulnerability: int(counts[index]) for index, vulnerability in enumerate(self._vulnerabilities)}
+
+    def get_detection_rate(self, strategy: str, vulnerabilities: list, include_new_detections: bool = True) -> map:
+        """returns the detection rate and the detections count by vulnerability
+        """
+        detections = self._detections[:, self._strategies.index(strategy)]
+        if not include_new_detections:
+            detections = detections * (self._labels > 0)
+        detections_count = detections.sum(axis=0)
+        vulnerabilities_count = self._labels.sum(axis=0)
+
+        detection_rate = {}
+        for vulnerability in vulnerabilities:
+            index = self._vulnerabilities.index(vulnerability)
+            detected = int(detections_count[index])
+            if vulnerabilities_count[index] == 0:
+                detection_rate[vulnerability] = (0, detected if include_new_detections else 0)
+            else:
+                detection_rate[vulnerability] = (detected / int(vulnerabilities_count[index]), detected)
+        return detection_rate
+
+    def get_detection_alarms(self, strategy: str, vulnerabilities: list) -> map:
+        """returns the true positives, false positives and false negatives by vulnerability
+        """
+        detected_executions = self._detected_executions[:, self._strategies.index(strategy)]
+        labeled = self._labels > 0
+        true_positives = (detected_executions * labeled).sum(axis=0)
+        false_positives = (detected_executions * ~labeled).sum(axis=0)
+        vulnerabilities_count = self._labels.sum(axis=0)
+
+        alarms_map = {}
+        for vulnerability in vulnerabilities:
+            index = self._vulnerabilities.index(vulnerability)
+            alarms_map[vulnerability] = {
+                "TP": int(true_positives[index]),
+                "FP": int(false_positives[index]),
+                "FN": int(vulnerabilities_count[index] - true_positives[index]),
+            }
+        return alarms_map
+
+    def _get_deviation(self, stats) -> float:
+        """pools the executions of every contract, counting repeated contracts once
+        """
+        _, unique_rows = np.unique(self._file_ids, return_index=True)
+        pooled_stats = RunningStats.merge_all(stats[unique_rows])
+        if pooled_stats.count == 0:
+            return -1
+        return pooled_stats.std
+
+    def _get_by_contract(self, values):
+        value_by_contract_name = {}
+        for contract, value in zip(self.contracts, values.tolist()):
+            value_by_contract_name[contract.file] = value
+
+        _, unique_rows = np.unique(self._file_ids, return_index=True)
+        unique_values = values[unique_rows]
+        successful_values = unique_values[unique_values != -1].tolist()
+        if len(successful_values) == 0:
+            return (value_by_contract_name, -1)
+        return (value_by_contract_name, sum(successful_values) / len(successful_values))
+
+
+class MetricsService():
+    """service that builds the metrics table of the extracted results
+    """
+
+    def __init__(self, context) -> None:
+        self._config = context.config
+        self._result_service = context.result_service
+
+    def build_table(self, strategies: list, fields: list = None) -> MetricsTable:
+        """scans the executions of every strategy once, one execution at a time.
+        Only the requested execution fields are loaded (all of them by default)
+        """
+        table = MetricsTable()
+        for strategy, contract_name, executions in self._result_service.iter_executions(strategies, fields):
+            table.add_contract_executions(strategy, contract_name, executions)
+        return table
+
+    def write_summary(self, results_folder_name: str) -> str:
+        """writes the metrics table and the instruction coverage over time of
+        the loaded results into the summary file of the experiment folder
+        """
+        table = self.build_table(FUZZING_TYPES)
+        instruction_coverage = {}
+        for strategy in FUZZING_TYPES:
+            contracts = ContractRegistry([Contract(contract_name) for contract_name in table.get_contract_names(strategy)])
+            instruction_coverage[strategy] = {
+                contract_name: [covered_instructions, coverage_percentage, list(coverage_over_time.items())]
+                for contract_name, (covered_instructions, coverage_percentage, coverage_over_time)
+                in self._result_service.get_instructions_coverage(strategy, contracts).items()
+            }
+
+        summary = {
+            "version": SUMMARY_VERSION,
+            "source": self._result_service.get_results_source(),
+            "metrics": table.to_summary(),
+            "instruction_coverage": instruction_coverage,
+        }
+        summary_file_path = os.path.join(self._config.results_folder, results_folder_name.rstrip('/'), SUMMARY_FILE)
+        with Workspace(self._config.temp_folder) as workspace:
+            with open(os.path.join(workspace.path, SUMMARY_FILE), 'w') as file:
+                json.dump(summary, file)
+            workspace.publish(os.path.dirname(summary_file_path))
+        return summary_file_path
+
+    def merge_summaries(self, summary_files: list, for_smartian: bool):
+        """merges the summary files into a metrics table and the instruction
+        coverage over time of every strategy, averaged across the summaries.
+        A summary of results already merged is skipped, the skipped files are
+        returned with the file their results were merged from
+        """
+        table = MetricsTable()
+        coverage_runs = {}
+        merged_files_by_source = {}
+        skipped_files = {}
+        for summary_file in summary_files:
+            with open(summary_file, 'r') as file:
+                summary = json.load(file)
+            if summary["version"] != SUMMARY_VERSION:
+                raise ValueError(
+                    f"the summary {summary_file} has version {summary['version']}, "
+                    f"please summarize the experiment again")
+            source = summary["source"]["sha256"]
+            if source in merged_files_by_source:
+                skipped_files[summary_file] = merged_files_by_source[source]
+                continue
+            merged_files_by_source[source] = summary_file
+
+            table.merge(MetricsTable.from_summary(summary["metrics"], for_smartian))
+            for strategy, coverage_by_contract_name in summary["instruction_coverage"].items():
+                for contract_name, coverage in coverage_by_contract_name.items():
+                    coverage_runs.setdefault(strategy, {}).setdefault(contract_name, []).append(coverage)
+
+        instruction_coverage = {}
+        for strategy, runs_by_contract_name in coverage_runs.items():
+            instruction_coverage[strategy] = {}
+            for contract_name, runs in runs_by_contract_name.items():
+                if len(runs) == 1:
+                    covered_instructions, coverage_percentage, samples = runs[0]
+                    instruction_coverage[strategy][contract_name] = (
+                        covered_instructions, coverage_percentage, dict(samples))
+                    continue
+                coverage_over_time = {}
+                for _, _, samples in runs:
+                    for second, value in samples:
+                        coverage_over_time[second] = coverage_over_time.get(second, 0) + value / len(runs)
+                instruction_coverage[strategy][contract_name] = (
+                    sum(x[0] for x in runs) / len(runs), sum(x[1] for x in runs) / len(runs), coverage_over_time)
+        return table, instruction_coverage, skipped_files
+
+    def get_summary_file(self, summary: str) -> str:
+        """returns the summary file path, given either the path or the experiment folder
+        """
+        if os.path.isfile(summary):
+            return summary
+        return os.path.join(self._config.results_folder, summary.rstrip('/'), SUMMARY_FILE)
@@ -1,37 +1,88 @@
 import os
-import json
 import numpy as np
 from collections import Counter
 import csv
 
-
-from matplotlib import pyplot as plt
-from sklearn.cluster import KMeans
-import matplotlib.ticker as mtick
-
-from aggregator.config import Config
-
-from aggregator.services.result import ResultService
-from aggregator.shared.constants import BLACKBOX_FUZZING, DIRECTED_GREYBOX_FUZZING, GREYBOX_FUZZING, OTHER_GREYBOX_FUZZING
-from aggregator.shared.singleton import SingletonMeta
+from aggregator.services.contract import ContractRegistry
+from aggregator.shared.discovery import BugDiscovery
+from aggregator.shared.constants import BLACKBOX_FUZZING, DIRECTED_GREYBOX_FUZZING, GREYBOX_FUZZING, OTHER_GREYBOX_FUZZING, FUZZING_TYPES
 from aggregator.shared.utils import *
+from aggregator.shared.workspace import Workspace
 
 
-FUZZING_TYPES = [BLACKBOX_FUZZING, DIRECTED_GREYBOX_FUZZING, GREYBOX_FUZZING, OTHER_GREYBOX_FUZZING]
+class OutputService():
 
-class OutputService(metaclass=SingletonMeta):
+    def __init__(self, context) -> None:
+        self._config = context.config
+        self._result_service = context.result_service
+        self._metrics_service = context.metrics_service
+        self._input_service = context.input_service
+        self._cluster_service = context.cluster_service
 
-    def __init__(self) -> None:
-        self._config = Config()
-        self._result_service = ResultService()
-
-    def write_report(self, results_folder_name: str, contracts: list, for_smartian: bool, not_labeled: bool):
+    def write_report(self, results_folder_name: str, contracts: ContractRegistry, for_smartian: bool, not_labeled: bool):
         """
         writes the output to the output file
         """
         results_folder = os.path.join(
             self._config.results_folder, results_folder_name)
+        table = self._metrics_service.build_table(FUZZING_TYPES)
+        coverage_by_strategy = {}
+        if for_smartian:
+            for strategy in FUZZING_TYPES:
+                coverage_by_strategy[strategy] = self._result_service.get_instructions_coverage(strategy, contracts)
+        self._write_report(results_folder, contracts, table, coverage_by_strategy, for_smartian, not_labeled)
+
+    def write_merged_report(
+        self,
+        output_folder: str,
+        contracts: ContractRegistry,
+        summary_files: list,
+        for_smartian: bool,
+        not_labeled: bool,
+    ):
+        """
+        writes the output of the merged summary files to the output folder,
+        returns the skipped summary files with the file their results were
+        merged from
+        """
+        table, instruction_coverage, skipped_files = self._metrics_service.merge_summaries(summary_files, for_smartian)
+        coverage_by_strategy = {}
+        for strategy in FUZZING_TYPES:
+            coverage_by_contract_name = instruction_coverage.get(strategy, {})
+            coverage_by_strategy[strategy] = {
+                contract.file: coverage_by_contract_name[contract.file]
+                for contract in contracts if contract.file in coverage_by_contract_name
+            }
+        self._write_report(output_folder, contracts, table, coverage_by_strategy, for_smartian, not_labeled)
+        return skipped_files
+
+    def _write_report(
+        self,
+        results_folder: str,
+        contracts: ContractRegistry,
+        table,
+        coverage_by_strategy: map,
+        for_smartian: bool,
+        not_labeled: bool,
+    ):
+        """
+        writes the report files in a workspace, then replaces the files in the
+        results folder with them, so concurrent reports never mix their files
+        """
+        with Workspace(self._config.temp_folder) as workspace:
+            self._write_report_files(
+                workspace.path, contracts, table, coverage_by_strategy, for_smartian, not_labeled)
+            workspace.publish(results_folder)
 
+    def _write_report_files(
+        self,
+        results_folder: str,
+        contracts: ContractRegistry,
+        table,
+        coverage_by_strategy: map,
+        for_smartian: bool,
+        not_labeled: bool,
+    ):
         critical_instructions = [
             "CALL",
             "SELFDESCTRUCT",
@@ -55,6 +106,9 @@ class OutputService(metaclass=SingletonMeta):
                 "RE",
             ]
 
+        rows = table.get_rows(
+            FUZZING_TYPES, contracts, critical_instructions, vulnerability_types)
+
         if not_labeled:
             for strategy in FUZZING_TYPES:
                 output_file_path = os.path.join(results_folder, f"bugs_over_time-{strategy}.txt")                
@@ -64,7 +118,7 @@ class OutputService(metaclass=SingletonMeta):
 
                 with open(output_file_path, 'w', newline='') as csv_file:
                     writer = csv.writer(csv_file)
-                    self._write_vulnerabilities_csv_not_labeled_time(writer, contracts, vulnerability_types, strategy)
+                    self._write_vulnerabilities_csv_not_labeled_time(writer, table, contracts, vulnerability_types, strategy)
                 
         output_file_path = os.path.join(results_folder, "average.txt")
 
@@ -73,19 +127,19 @@ class OutputService(metaclass=SingletonMeta):
 
         with open(output_file_path, "wt", encoding="utf-8") as f:
             self._write_line(f, 'AVERAGE RESULTS')
-            self._write_transaction_count(f, contracts)
-            self._write_max_coverage_result(f, contracts)
-            self._write_average_coverage_result(f, contracts)
-            # self._write_critial_instructions_hits(f, contracts)executions_by_contract_name[contract_name]
+            self._write_transaction_count(f, rows)
+            self._write_max_coverage_result(f, rows)
+            self._write_average_coverage_result(f, rows)
+            # self._write_critial_instructions_hits(f, rows)
             self._write_critial_instructions_detailed_hits(
-                f, contracts, critical_instructions)
+                f, rows, critical_instructions)
             
             if not_labeled:
                 self._write_vulnerabilities_not_labeled(
-                    f, contracts, vulnerability_types)
+                    f, rows, vulnerability_types)
             else:
                 self._write_vulnerabilities(
-                    f, contracts, vulnerability_types, False)
+                    f, rows, vulnerability_types, False)
                 
 
         if for_smartian:
@@ -96,7 +150,7 @@ class OutputService(metaclass=SingletonMeta):
                     os.remove(output_file_path)
 
                 with open(output_file_path, "wt", encoding="utf-8") as f:
-                    self._write_vulnerabilities_table_per_contract(f, contracts, vulnerability_types, strategy)
+                    self._write_vulnerabilities_table_per_contract(f, table, contracts, vulnerability_types, strategy)
 
                 output_cov_file = os.path.join(results_folder, f"smartian-cov-{strategy}.txt")
 
@@ -104,7 +158,7 @@ class OutputService(metaclass=SingletonMeta):
                     os.remove(output_cov_file)
 
                 with open(output_cov_file, "wt", encoding="utf-8") as f:
-                    self._write_coverage_table_over_time(f, contracts, strategy)
+                    self._write_coverage_table_over_time(f, coverage_by_strategy[strategy])
 
                 # Alarms file
                 output_alarms_file = os.path.join(results_folder, f"smartian-alarms-{strategy}.txt")
@@ -113,7 +167,7 @@ class OutputService(metaclass=SingletonMeta):
                     os.remove(output_alarms_file)
 
                 with open(output_alarms_file, "wt", encoding="utf-8") as f:
-                    self._write_alarms_table(f, contracts, strategy, vulnerability_types)
+                    self._write_alarms_table(f, rows, strategy, vulnerability_types)
 
 
 
@@ -122,95 +176,66 @@ class OutputService(metaclass=SingletonMeta):
                 results_folder, f"vulnerability-{vulnerability_type}.txt")
             if os.path.exists(file_path):
                 os.remove(file_path)
-            filtered_contracts = []
-            for contract in contracts:
-                for vulnerability in contract["vulnerabilities"]:
-                    if vulnerability == vulnerability_type:
-                        filtered_contracts.append(contract)
+            filtered_rows = rows.select(
+                rows.get_vulnerability_mask(vulnerability_type))
             with open(file_path, "wt", encoding="utf-8") as f:
                 self._write_line(f, f'{vulnerability_type.upper()} RESULTS')
-                self._write_max_coverage_result(f, filtered_contracts)
-                self._write_average_coverage_result(f, filtered_contracts)
+                self._write_max_coverage_result(f, filtered_rows)
+                self._write_average_coverage_result(f, filtered_rows)
                 self._write_critial_instructions_detailed_hits(
-                    f, filtered_contracts, critical_instructions)
+                    f, filtered_rows, critical_instructions)
                 if not_labeled:
                     self._write_vulnerabilities_not_labeled(
-                        f, contracts, vulnerability_types)
+                        f, rows, vulnerability_types)
                 else:
                     self._write_vulnerabilities(
-                        f, contracts, vulnerability_types, False)
-
-        inputs_file_folder = os.path.join(
-            self._config.temp_folder, self._config.inputs_folder)
-        inputs_file = os.path.join(inputs_file_folder, "inputs.json")
-
-        dataset_array = []
-        contracts_name = None
-        with open(inputs_file, 'r', encoding='utf-8') as f:
-            inputs = json.load(f)
-            contracts_name = [0] * len(inputs)
-            for idx, contract in enumerate(inputs):
-                contract_name = contract['name']
-                contracts_name[idx] = contract_name
-                row = [contract['numberOfBranches'], sum(
-                    contract["numberOfCriticalInstructions"].values())]
-                dataset_array.append(row)
-        kmeans = KMeans(
-            n_clusters=3,
-            init='random',
-            n_init=10,
-            max_iter=100,
-        )
-        kmeans.fit(np.array(dataset_array))
+                        f, rows, vulnerability_types, False)
+
+        clustering = self._cluster_service.get_clustering(3)
 
         clusters = {}
-        letters = ['A', 'B', 'C']
-        for idx, cluster in enumerate(kmeans.labels_):
-            key = letters[cluster]
+        for contract_name, key in zip(clustering.contract_names, clustering.get_letters()):
             if key not in clusters:
                 clusters[key] = []
-            contract_info = [
-                contract for contract in contracts if contract['name'] == contracts_name[idx]]
-            if len(contract_info) > 0:
-                clusters[key].append(contract_info[0])
+            row = contracts.get_row(contract_name)
+            if row is not None:
+                clusters[key].append(row)
 
-        for key, contracts in clusters.items():
+        for key, cluster_rows in clusters.items():
             file_path = os.path.join(
                 results_folder, f"cluster-group-{key.lower()}.txt")
             if os.path.exists(file_path):
                 os.remove(file_path)
+            cluster_rows = rows.select(np.array(cluster_rows, dtype=np.int64))
             with open(file_path, "wt", encoding="utf-8") as f:
                 self._write_line(f, f'GROUP {key.upper()} RESULTS')
-                self._write_max_coverage_result(f, contracts)
-                self._write_average_coverage_result(f, contracts)
-                # self._write_critial_instructions_hits(f, contracts)
+                self._write_max_coverage_result(f, cluster_rows)
+                self._write_average_coverage_result(f, cluster_rows)
+                # self._write_critial_instructions_hits(f, cluster_rows)
                 self._write_critial_instructions_detailed_hits(
-                    f, contracts, critical_instructions)
+                    f, cluster_rows, critical_instructions)
                 if not_labeled:
                     self._write_vulnerabilities_not_labeled(
-                        f, contracts, vulnerability_types)
+                        f, cluster_rows, vulnerability_types)
                 else:
                     self._write_vulnerabilities(
-                        f, contracts, vulnerability_types, False)
+                        f, cluster_rows, vulnerability_types, False)
                 
     def get_max_coverage_result(self, contracts: list):
-        
-        (max_coverage_per_contract_for_blackbox, average_coverage_for_blackbox) = self._result_service.get_max_coverage_by_strategy(
+        rows = self._metrics_service.build_table(FUZZING_TYPES, ["maxCoverage", "totalInstructions"]).get_rows(
+            FUZZING_TYPES, contracts, [], [])
+        (max_coverage_per_contract_for_blackbox, average_coverage_for_blackbox) = rows.get_max_coverage(
             BLACKBOX_FUZZING,
-            contracts,
         )
-        (max_coverage_per_contract_for_greybox, average_coverage_for_greybox) = self._result_service.get_max_coverage_by_strategy(
+        (max_coverage_per_contract_for_greybox, average_coverage_for_greybox) = rows.get_max_coverage(
             GREYBOX_FUZZING,
-            contracts,
         )
-        (max_coverage_per_contract_for_directed_greybox, average_coverage_for_directed_greybox) = self._result_service.get_max_coverage_by_strategy(
+        (max_coverage_per_contract_for_directed_greybox, average_coverage_for_directed_greybox) = rows.get_max_coverage(
             DIRECTED_GREYBOX_FUZZING,
-            contracts,
         )
 
-        (max_coverage_per_contract_for_other_directed_greybox, average_coverage_for_other_directed_greybox) = self._result_service.get_max_coverage_by_strategy(
+        (max_coverage_per_contract_for_other_directed_greybox, average_coverage_for_other_directed_greybox) = rows.get_max_coverage(
             OTHER_GREYBOX_FUZZING,
-            contracts,
         )
 
         blackbox_per_list = []
@@ -218,7 +243,7 @@ class OutputService(metaclass=SingletonMeta):
         directed_greybox_per_list = []
         
         for contract in contracts:
-            contract_name = contract["file"]
+            contract_name = contract.file
             
             blackbox = max_coverage_per_contract_for_blackbox[
                 contract_name] if contract_name in max_coverage_per_contract_for_blackbox else -1
@@ -248,30 +273,26 @@ class OutputService(metaclass=SingletonMeta):
             average_coverage_for_greybox*100,
             average_coverage_for_directed_greybox*100)
         
-    def _write_max_coverage_result(self, file, contracts: list):
+    def _write_max_coverage_result(self, file, rows):
         
-        (max_coverage_per_contract_for_blackbox, average_coverage_for_blackbox) = self._result_service.get_max_coverage_by_strategy(
+        (max_coverage_per_contract_for_blackbox, average_coverage_for_blackbox) = rows.get_max_coverage(
             BLACKBOX_FUZZING,
-            contracts,
         )
-        (max_coverage_per_contract_for_greybox, average_coverage_for_greybox) = self._result_service.get_max_coverage_by_strategy(
+        (max_coverage_per_contract_for_greybox, average_coverage_for_greybox) = rows.get_max_coverage(
             GREYBOX_FUZZING,
-            contracts,
         )
-        (max_coverage_per_contract_for_directed_greybox, average_coverage_for_directed_greybox) = self._result_service.get_max_coverage_by_strategy(
+        (max_coverage_per_contract_for_directed_greybox, average_coverage_for_directed_greybox) = rows.get_max_coverage(
             DIRECTED_GREYBOX_FUZZING,
-            contracts,
         )
 
-        (max_coverage_per_contract_for_other_directed_greybox, average_coverage_for_other_directed_greybox) = self._result_service.get_max_coverage_by_strategy(
+        (max_coverage_per_contract_for_other_directed_greybox, average_coverage_for_other_directed_greybox) = rows.get_max_coverage(
             OTHER_GREYBOX_FUZZING,
-            contracts,
         )
 
         self._write_header(file, 'MAX COVERAGE RESULTS', "contract")
 
-        for contract in contracts:
-            contract_name = contract["file"]
+        for contract in rows.contracts:
+            contract_name = contract.file
             
             blackbox = max_coverage_per_contract_for_blackbox[
                 contract_name] if contract_name in max_coverage_per_contract_for_blackbox else -1
@@ -304,30 +325,34 @@ class OutputService(metaclass=SingletonMeta):
             average_coverage_for_directed_greybox,
             average_coverage_for_other_directed_greybox
         )
+        self._write_deviation_footer(
+            file,
+            rows.get_max_coverage_deviation(BLACKBOX_FUZZING),
+            rows.get_max_coverage_deviation(GREYBOX_FUZZING),
+            rows.get_max_coverage_deviation(DIRECTED_GREYBOX_FUZZING),
+            rows.get_max_coverage_deviation(OTHER_GREYBOX_FUZZING),
+            True,
+        )
 
-    def _write_average_coverage_result(self, file, contracts: list):
-        (average_coverage_per_contract_for_blackbox, average_converage_for_blackbox) = self._result_service.get_average_coverage_by_strategy(
+    def _write_average_coverage_result(self, file, rows):
+        (average_coverage_per_contract_for_blackbox, average_converage_for_blackbox) = rows.get_average_coverage(
             BLACKBOX_FUZZING,
-            contracts,
         )
-        (average_coverage_per_contract_for_greybox, average_coverage_for_greybox) = self._result_service.get_average_coverage_by_strategy(
+        (average_coverage_per_contract_for_greybox, average_coverage_for_greybox) = rows.get_average_coverage(
             GREYBOX_FUZZING,
-            contracts,
         )
-        (average_coverage_per_contract_for_directed_greybox, average_coverage_for_directed_greybox) = self._result_service.get_average_coverage_by_strategy(
+        (average_coverage_per_contract_for_directed_greybox, average_coverage_for_directed_greybox) = rows.get_average_coverage(
             DIRECTED_GREYBOX_FUZZING,
-            contracts,
         )
 
-        (average_coverage_per_contract_for_other_directed_greybox, average_coverage_for_other_directed_greybox) = self._result_service.get_average_coverage_by_strategy(
+        (average_coverage_per_contract_for_other_directed_greybox, average_coverage_for_other_directed_greybox) = rows.get_average_coverage(
             OTHER_GREYBOX_FUZZING,
-            contracts,
         )
 
         self._write_header(file, 'AVERAGE COVERAGE RESULTS', "contract")
 
-        for contract in contracts:
-            contract_name = contract["file"]
+        for contract in rows.contracts:
+            contract_name = contract.file
             blackbox = average_coverage_per_contract_for_blackbox[
                 contract_name] if contract_name in average_coverage_per_contract_for_blackbox else -1
             greybox = average_coverage_per_contract_for_greybox[
@@ -357,30 +382,34 @@ class OutputService(metaclass=SingletonMeta):
             average_coverage_for_directed_greybox,
             average_coverage_for_other_directed_greybox
         )
+        self._write_deviation_footer(
+            file,
+            rows.get_average_coverage_deviation(BLACKBOX_FUZZING),
+            rows.get_average_coverage_deviation(GREYBOX_FUZZING),
+            rows.get_average_coverage_deviation(DIRECTED_GREYBOX_FUZZING),
+            rows.get_average_coverage_deviation(OTHER_GREYBOX_FUZZING),
+            True,
+        )
 
-    def _write_critial_instructions_hits(self, file, contracts: list):
-        (hits_per_contract_for_blackbox, average_hits_for_blackbox) = self._result_service.get_hits_by_strategy(
+    def _write_critial_instructions_hits(self, file, rows):
+        (hits_per_contract_for_blackbox, average_hits_for_blackbox) = rows.get_hits(
             BLACKBOX_FUZZING,
-            contracts,
         )
-        (hits_per_contract_for_greybox, average_hits_for_greybox) = self._result_service.get_hits_by_strategy(
+        (hits_per_contract_for_greybox, average_hits_for_greybox) = rows.get_hits(
             GREYBOX_FUZZING,
-            contracts,
         )
-        (hits_per_contract_for_directed_greybox, average_hits_for_directed_greybox) = self._result_service.get_hits_by_strategy(
+        (hits_per_contract_for_directed_greybox, average_hits_for_directed_greybox) = rows.get_hits(
             DIRECTED_GREYBOX_FUZZING,
-            contracts,
         )
 
-        (hits_per_contract_for_other_directed_greybox, average_hits_for_other_directed_greybox) = self._result_service.get_hits_by_strategy(
+        (hits_per_contract_for_other_directed_greybox, average_hits_for_other_directed_greybox) = rows.get_hits(
             OTHER_GREYBOX_FUZZING,
-            contracts,
         )
 
         self._write_header(file, 'CRITICAL INSTRUCTIONS HITS RESULTS', "instruction")
 
-        for contract in contracts:
-            contract_name = contract["file"]
+        for contract in rows.contracts:
+            contract_name = contract.file
             blackbox = hits_per_contract_for_blackbox[
                 contract_name] if contract_name in hits_per_contract_for_blackbox else -1
             greybox = hits_per_contract_for_greybox[
@@ -409,27 +438,19 @@ class OutputService(metaclass=SingletonMeta):
             average_hits_for_other_directed_greybox
         )
 
-    def _write_critial_instructions_detailed_hits(self, file, contracts: list, critical_instructions: list):
-        (hits_per_instruction_for_blackbox, average_hits_for_blackbox) = self._result_service.get_hits_by_instructions_and_strategy(
+    def _write_critial_instructions_detailed_hits(self, file, rows, critical_instructions: list):
+        (hits_per_instruction_for_blackbox, average_hits_for_blackbox) = rows.get_hits_by_instructions(
             BLACKBOX_FUZZING,
-            contracts,
-            critical_instructions,
         )
-        (hits_per_instruction_for_greybox, average_hits_for_greybox) = self._result_service.get_hits_by_instructions_and_strategy(
+        (hits_per_instruction_for_greybox, average_hits_for_greybox) = rows.get_hits_by_instructions(
             GREYBOX_FUZZING,
-            contracts,
-            critical_instructions,
         )
-        (hits_per_instruction_for_directed_greybox, average_hits_for_directed_greybox) = self._result_service.get_hits_by_instructions_and_strategy(
+        (hits_per_instruction_for_directed_greybox, average_hits_for_directed_greybox) = rows.get_hits_by_instructions(
             DIRECTED_GREYBOX_FUZZING,
-            contracts,
-            critical_instructions,
         )
 
-        (hits_per_instruction_for_other_directed_greybox, average_hits_for_other_directed_greybox) = self._result_service.get_hits_by_instructions_and_strategy(
+        (hits_per_instruction_for_other_directed_greybox, average_hits_for_other_directed_greybox) = rows.get_hits_by_instructions(
             OTHER_GREYBOX_FUZZING,
-            contracts,
-            critical_instructions,
         )
 
         self._write_header(file, 'DETAILED CRITICAL INSTRUCTIONS HITS RESULTS', "instruction")
@@ -468,31 +489,27 @@ class OutputService(metaclass=SingletonMeta):
     def _write_vulnerabilities_not_labeled(
         self,
         file,
-        contracts: list,
+        rows,
         vulnerability_types: list
     ):
-        detection_rate_for_blackbox = self._result_service.get_detection_rate_by_strategy(
+        detection_rate_for_blackbox = rows.get_detection_rate(
             BLACKBOX_FUZZING,
-            contracts,
             vulnerability_types,
             True,
         )
-        detection_rate_for_greybox = self._result_service.get_detection_rate_by_strategy(
+        detection_rate_for_greybox = rows.get_detection_rate(
             GREYBOX_FUZZING,
-            contracts,
             vulnerability_types,
             True,
         )
-        detection_rate_for_directed_greybox = self._result_service.get_detection_rate_by_strategy(
+        detection_rate_for_directed_greybox = rows.get_detection_rate(
             DIRECTED_GREYBOX_FUZZING,
-            contracts,
             vulnerability_types,
             True,
         )
 
-        detection_rate_for_other_directed_greybox = self._result_service.get_detection_rate_by_strategy(
+        detection_rate_for_other_directed_greybox = rows.get_detection_rate(
             OTHER_GREYBOX_FUZZING,
-            contracts,
             vulnerability_types,
             True,
         )
@@ -535,39 +552,35 @@ class OutputService(metaclass=SingletonMeta):
     def _write_vulnerabilities(
         self,
         file,
-        contracts: list,
+        rows,
         vulnerability_types: list,
         include_new_detections: bool = False,
     ):
-        detection_rate_for_blackbox = self._result_service.get_detection_rate_by_strategy(
+        detection_rate_for_blackbox = rows.get_detection_rate(
             BLACKBOX_FUZZING,
-            contracts,
             vulnerability_types,
             include_new_detections,
         )
-        detection_rate_for_greybox = self._result_service.get_detection_rate_by_strategy(
+        detection_rate_for_greybox = rows.get_detection_rate(
             GREYBOX_FUZZING,
-            contracts,
             vulnerability_types,
             include_new_detections,
         )
-        detection_rate_for_directed_greybox = self._result_service.get_detection_rate_by_strategy(
+        detection_rate_for_directed_greybox = rows.get_detection_rate(
             DIRECTED_GREYBOX_FUZZING,
-            contracts,
             vulnerability_types,
             include_new_detections,
         )
 
-        detection_rate_for_other_directed_greybox = self._result_service.get_detection_rate_by_strategy(
+        detection_rate_for_other_directed_greybox = rows.get_detection_rate(
             OTHER_GREYBOX_FUZZING,
-            contracts,
             vulnerability_types,
             include_new_detections,
         )
 
         self._write_header(file, 'VULNERABILITIES RESULTS', "vulnerability type")
         
-        vul_count = self._result_service.get_vulnerabilities_count(contracts, vulnerability_types)
+        vul_count = rows.get_vulnerabilities_count()
      
         average_detection_rate_for_blackbox = 0
         average_detection_rate_for_greybox = 0
@@ -634,71 +647,58 @@ class OutputService(metaclass=SingletonMeta):
         else:
             self._write_dashed_line(file)
 
-    def _count_found_before(self, bug_sigs, time_map, sec):
-        n = 0
-        for (targ, found_bug) in time_map:
-            found_time = time_map[(targ, found_bug)]
-            if found_bug in bug_sigs and found_time < sec:
-                n += 1
-        return n
-
     def _write_count_over_time_frame(
         self,
         file,
         vulnerability_types: list,        
-        time_map_list: list,
+        bug_discovery: BugDiscovery,
         time_frame_in_seconds: int,
         upper_limit_in_seconds: int
     ):                    
-        for time in range(0, upper_limit_in_seconds + time_frame_in_seconds, time_frame_in_seconds):
-            sec = time
-            bug_sigs = list(map(lambda x: map_vulnerability_smartian_to_long_name(x), vulnerability_types))
-            count_list = []
-            for time_map in time_map_list:
-                count_list.append(self._count_found_before(bug_sigs, time_map, sec))
-            count_avg = float(sum(count_list)) / len(count_list)
+        bug_sigs = [map_vulnerability_smartian_to_long_name(x) for x in vulnerability_types]
+        times, counts = bug_discovery.curve(time_frame_in_seconds, upper_limit_in_seconds, bug_sigs)
+        for time, count_avg in zip(times.tolist(), counts.tolist()):
             self._write_line(file, f"{time:02d}s: {count_avg:.1f}")
 
     def _write_count_over_time(
         self,
         file,
         vulnerability_types: list,        
-        time_map_list: list
+        bug_discovery: BugDiscovery,
     ):                    
-        for minute in range(0, 60 + 5, 5):
-            sec = 60 * minute
-            bug_sigs = list(map(lambda x: map_vulnerability_smartian_to_long_name(x), vulnerability_types))
-            count_list = []
-            for time_map in time_map_list:
-                count_list.append(self._count_found_before(bug_sigs, time_map, sec))
-            count_avg = float(sum(count_list)) / len(count_list)
-            self._write_line(file, f"{minute:02d}m: {count_avg:.1f}")
+        bug_sigs = [map_vulnerability_smartian_to_long_name(x) for x in vulnerability_types]
+        times, counts = bug_discovery.curve(5 * 60, 60 * 60, bug_sigs)
+        for sec, count_avg in zip(times.tolist(), counts.tolist()):
+            self._write_line(file, f"{sec // 60:02d}m: {count_avg:.1f}")
 
     def _write_vulnerabilities_table_per_contract(
         self,
         file,
+        table,
         contracts: list,
         vulnerability_types: list, 
         strategy: str,        
     ):                    
-        detected_true_positive, time_map_list = self._result_service.get_detection_by_strategy(strategy, contracts, vulnerability_types)
+        detected_true_positive, time_map_list = table.get_detection(strategy, contracts, vulnerability_types)
         for vulnerability_type in vulnerability_types:
             for line in detected_true_positive[vulnerability_type]:
                 self._write_line(file, f"{line}")
             self._write_line(file, "===================================")
         if len(time_map_list) != 0:
-            self._write_count_over_time(file, vulnerability_types, time_map_list)
+            bug_discovery = BugDiscovery(time_map_list)
+            self._write_count_over_time(file, vulnerability_types, bug_discovery)
             self._write_line(file, "===================================TIME_FRAME")
-            self._write_count_over_time_frame(file, vulnerability_types, time_map_list, 15, 300)
+            self._write_count_over_time_frame(file, vulnerability_types, bug_discovery, 15, 300)
 
     def _write_vulnerabilities_csv_not_labeled_time(
         self,
         file,
+        table,
         contracts: list,
         vulnerability_types: list,
         strategy: str
     ):                    
-        detected = self._result_service.get_detection_by_strategy_csv(strategy, contracts)
+        detected = table.get_detection_csv(strategy, contracts)
         for row in detected:
             file.writerow(row)
 
@@ -707,13 +707,13 @@ class OutputService(metaclass=SingletonMeta):
     def _write_alarms_table(
         self,
         file,
-        contracts: list,
+        rows,
         strategy: str,        
         vulnerability_types: list        
     ):
         
         self._write_line(file, "===================================")        
-        alarms = self._result_service.get_detection_alarms(strategy, contracts, vulnerability_types, False)
+        alarms = rows.get_detection_alarms(strategy, vulnerability_types)
         for vulnerability_type in vulnerability_types:
             tp = (alarms[vulnerability_type]["TP"])
             fp = (alarms[vulnerability_type]["FP"])
@@ -724,36 +724,29 @@ class OutputService(metaclass=SingletonMeta):
     def _write_coverage_table_over_time(
         self,
         file,
-        contracts: list,
-        strategy: str,        
+        coverage_map: map,
     ):                    
-        coverage_map = self._result_service.get_instructions_coverage(strategy, contracts)
-        
         total_coverage_over_time = Counter()
         for _, _, coverage_over_time in coverage_map.values():
             total_coverage_over_time += Counter(coverage_over_time)
         final_dict_cov = dict(total_coverage_over_time)
         self._write_line(file, f"{0:02d}m: {0:.1f}")
-        for minute, total in final_dict_cov.items():
-            self._write_line(file, f"{minute:02d}m: {total:.1f}")
+        for second, total in final_dict_cov.items():
+            self._write_line(file, f"{second // 60:02d}m: {total:.1f}")
 
-    def _write_transaction_count(self, file, contracts: list):
-        transaction_count_for_blackbox = self._result_service.get_transaction_count_by_strategy(
+    def _write_transaction_count(self, file, rows):
+        transaction_count_for_blackbox = rows.get_transaction_count(
             BLACKBOX_FUZZING,
-            contracts,
         )
-        transaction_count_for_greybox = self._result_service.get_transaction_count_by_strategy(
+        transaction_count_for_greybox = rows.get_transaction_count(
             GREYBOX_FUZZING,
-            contracts,
         )
-        transaction_count_for_directed_greybox = self._result_service.get_transaction_count_by_strategy(
+        transaction_count_for_directed_greybox = rows.get_transaction_count(
             DIRECTED_GREYBOX_FUZZING,
-            contracts,
         )
 
-        transaction_count_for_other_directed_greybox = self._result_service.get_transaction_count_by_strategy(
+        transaction_count_for_other_directed_greybox = rows.get_transaction_count(
             OTHER_GREYBOX_FUZZING,
-            contracts,
         )
 
         self._write_header(file, 'TRANSACTION COUNT RESULTS', "count")
@@ -771,6 +764,14 @@ class OutputService(metaclass=SingletonMeta):
             file, f"| {'transaction_count':45} | {blackbox:20} | {greybox:20} | {directed_greybox:20} | {other_directed_greybox:20} |")
 
         self._write_dashed_line(file)
+        self._write_deviation_footer(
+            file,
+            rows.get_transaction_count_deviation(BLACKBOX_FUZZING),
+            rows.get_transaction_count_deviation(GREYBOX_FUZZING),
+            rows.get_transaction_count_deviation(DIRECTED_GREYBOX_FUZZING),
+            rows.get_transaction_count_deviation(OTHER_GREYBOX_FUZZING),
+            False,
+        )
 
     def _write_header(self, file, title: str, text: str):
         self._write_line(file, "\n")
@@ -802,6 +803,20 @@ class OutputService(metaclass=SingletonMeta):
             file, f"| {'AVERAGE':45} | {percentage_blackbox:20} | {percentage_greybox:20} | {percentage_directed_greybox:20} | {percentage_other_directed_greybox:20} |")
         self._write_dashed_line(file)
 
+    def _write_deviation_footer(
+        self,
+        file,
+        deviation_blackbox,
+        deviation_greybox,
+        deviation_directed_greybox,
+        deviation_other_directed_greybox,
+        as_percentage: bool,
+    ):
+        convert = self._convert_to_percentage_str if as_percentage else self._convert_to_str
+        self._write_line(
+            file, f"| {'STANDARD DEVIATION':45} | {convert(deviation_blackbox):20} | {convert(deviation_greybox):20} | {convert(deviation_directed_greybox):20} | {convert(deviation_other_directed_greybox):20} |")
+        self._write_dashed_line(file)
+
     def _write_average_footer_with_total(
         self,
         file, total_vulnerabilities,
@@ -1,102 +1,131 @@
+import io
 import os
-import zipfile
-import json
-import shutil
-from dateutil import parser
-from datetime import datetime, timedelta
-
-from aggregator.config import Config
-from aggregator.shared.singleton import SingletonMeta
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
+
+import numpy as np
+
+from aggregator.services.metrics import ContractMetrics, MetricsTable
+from aggregator.shared.archive import ZipArchive, file_digest
+from aggregator.shared.compiled import CompiledResults, ExecutionColumns, write_compiled_results
+from aggregator.shared.coverage import CoverageMatrix, resample
+from aggregator.shared.exceptions import ResultsNotFoundException
+from aggregator.shared.instructions import InstructionIndex
+from aggregator.shared.statistics import RunningStats
+from aggregator.shared.stream import ResultsStream
+from aggregator.shared.timeline import MICROSECONDS_PER_SECOND, decode_timestamps, sample_indexes
+from aggregator.shared.workspace import Workspace
 from aggregator.shared.utils import *
 from aggregator.shared.constants import *
 
-
-class ResultService(metaclass=SingletonMeta):
-
-    def __init__(self) -> None:
-        self._config = Config()
+# the execution fields aggregated for the per strategy getters
+AGGREGATED_FIELDS = ["maxCoverage", "averageCoverage", "criticalInstructionsHits", "coverageByTime", "instructionIndex"]
 
 
+class ResultService():
 
+    def __init__(self, context) -> None:
+        self._config = context.config
+        self._executions_cache = {}
+        self._smartian_cache = {}
+        self._coverage_matrix_cache = {}
+        self._metrics_table_cache = {}
+        self._results_archive = None
+        self._compiled_results = None
+        self._for_smartian = False
 
     def convert_results_to_smartian(self, results_folder_name: str):
-        results_folder = os.path.join(
-        self._config.temp_folder, self._config.results_dir)
-        strategy_result_folder = results_folder
-    
-        for path in os.listdir(strategy_result_folder):
-            with open(os.path.join(strategy_result_folder, path), 'r+', encoding='utf-8') as file:
-                results_content = json.load(file)
-            
-                def process_data(data):
-                    if isinstance(data, dict):
-                        for key, value in data.items():
-                            if key == "execution" and isinstance(value, dict) and "detectedWeaknesses" in value:
-                                value["detectedWeaknesses"] = list(set(
-                                    x for x in [map_weakness_to_smartian_standard(x) for x in value["detectedWeaknesses"]] 
-                                    if x is not None
-                                ))
-                            elif isinstance(value, (dict, list)):
-                                process_data(value)
-                    elif isinstance(data, list):
-                        for item in data:
-                            process_data(item)
-                        
-                process_data(results_content)
-                file.seek(0)
-                file.truncate()
-                json.dump(results_content, file, indent=4)
-
-            
-    def convert_results_to_smartian_2(self, results_folder_name: str):
-        results_folder = os.path.join(
-            self._config.temp_folder, self._config.results_dir)
-        strategy_result_folder = results_folder
-
-        for path in os.listdir(strategy_result_folder):
-            with open(os.path.join(strategy_result_folder, path), 'r+', encoding='utf-8') as file:                 
-                results_content = json.load(file)
-                for contract_name in results_content.keys():                    
-                    #for index in [BLACKBOX_FUZZING, GREYBOX_FUZZING, DIRECTED_GREYBOX_FUZZING, OTHER_GREYBOX_FUZZING]:
-                    for index in results_content[contract_name].keys():
-                        if results_content[contract_name][index][0]["execution"] is not None:
-                            detectedWeaknesses = results_content[contract_name][index][0]["execution"]["detectedWeaknesses"]
-                            detectedWeaknesses = [x for x in [map_weakness_to_smartian_standard(x) for x in detectedWeaknesses] if x is not None]
-                            results_content[contract_name][index][0]["execution"]["detectedWeaknesses"] = list(set(detectedWeaknesses))
-                file.seek(0)
-                json.dump(results_content, file, indent=4)    
-                
-    def extract_results(self, results_folder_name: str):
         """
-        extracts results file from folder
+        presents the detected weaknesses of the loaded results in the smartian
+        standard, the results are neither parsed again nor rewritten
         """
-        
-        clean_results_folder_name = results_folder_name.rstrip('/')
-        results_folder = os.path.join(
-            self._config.temp_folder, self._config.results_dir)
-        results_zip_file_path = os.path.join(
-            self._config.results_folder, clean_results_folder_name, f"{clean_results_folder_name}.zip")
+        self._for_smartian = True
 
-        if os.path.exists(results_folder):
-            shutil.rmtree(results_folder, ignore_errors=True)
-        os.makedirs(results_folder)
+    def load_results(self, results_folder_name: str):
+        """
+        opens the results of the experiment folder. The compiled results are
+        memory mapped when they match the results zip, otherwise (outdated
+        compiled results included) the zip members are read straight from the
+        archive
+        """
+        results_zip_file_path = self._get_results_zip_file_path(results_folder_name)
+        compiled_results_folder = self._get_compiled_results_folder(results_folder_name)
+
+        self._close_results()
+        if CompiledResults.exists(compiled_results_folder):
+            compiled_results = CompiledResults(compiled_results_folder)
+            if not os.path.isfile(results_zip_file_path) \
+                    or compiled_results.is_compiled_from(results_zip_file_path):
+                self._compiled_results = compiled_results
+                return
+        self._results_archive = ZipArchive(results_zip_file_path)
+
+    def compile_results(self, results_folder_name: str) -> str:
+        """
+        parses the results zip of the experiment folder and writes its
+        successful executions as compiled results next to it. The compiled
+        results are written in a workspace and replace the former ones at
+        once, so readers never see a partially written store
+        """
+        results_zip_file_path = self._get_results_zip_file_path(results_folder_name)
+        compiled_results_folder = self._get_compiled_results_folder(results_folder_name)
+
+        self._close_results()
+        self._results_archive = ZipArchive(results_zip_file_path)
+        executions_by_strategy = {
+            strategy: self._parse_results_file(strategy, frozenset(EXECUTION_FIELDS)) for strategy in FUZZING_TYPES}
+        with Workspace(self._config.temp_folder) as workspace:
+            write_compiled_results(
+                os.path.join(workspace.path, COMPILED_RESULTS_FOLDER), results_zip_file_path, executions_by_strategy)
+            workspace.publish(os.path.dirname(compiled_results_folder), [COMPILED_RESULTS_FOLDER])
+        return compiled_results_folder
+
+    def get_executions(self, strategy: str, fields: list = None) -> map:
+        """
+        returns the successful executions of a strategy by contract name, only
+        the requested execution fields are kept (all of them by default)
+        """
+        return {
+            contract_name: list(executions) if isinstance(executions, ExecutionColumns) else executions
+            for contract_name, executions in self._read_results_file(strategy, fields).items()
+        }
 
-        with zipfile.ZipFile(results_zip_file_path, 'r') as zip_file:
-            zip_file.extractall(results_folder)
+    def iter_executions(self, strategies: list, fields: list = None):
+        """
+        yields (strategy, contract name, executions) records for the
+        strategies, a record of a contract already yielded replaces it. Unless
+        the executions were already parsed, or are compiled or read by worker
+        processes, the results files are streamed and the executions are
+        decoded while they are iterated, without being kept
+        """
+        fields = frozenset(EXECUTION_FIELDS if fields is None else fields) | {"totalInstructions"}
+        for strategy_result_folder, folder_strategies in self._group_strategies_by_folder(strategies, fields):
+            if strategy_result_folder is None:
+                for strategy in folder_strategies:
+                    for contract_name, executions in self._read_results_file(strategy, fields).items():
+                        yield strategy, contract_name, executions
+                continue
+
+            for member in self._results_archive.list_members(strategy_result_folder):
+                for strategy, contract_name, executions in _iter_results_member(
+                        self._results_archive, member, folder_strategies, fields):
+                    if self._for_smartian:
+                        executions = map(self._to_smartian_execution, executions)
+                    yield strategy, contract_name, executions
 
     def get_max_coverage_by_strategy(self, strategy: str, contracts: list):
         """
         returns the max coverage by strategy name
         """
-        executions_by_contract_name = self._read_results_file(strategy)
+        table = self._get_metrics_table(strategy)
 
         coverage_by_contract_name = self._init_result_dict(contracts)
         for contract in contracts:
-            contract_name = contract["file"]
-            coverage_by_contract_name[contract_name] = self._get_executions_average_coverage(
-                executions_by_contract_name,
-                contract_name,
-                "maxCoverage",
+            contract_name = contract.file
+            coverage_by_contract_name[contract_name] = self._get_executions_mean(
+                table.get(strategy, contract_name),
+                lambda metrics: metrics.max_coverage,
             )
 
         sucessful_runs = [
@@ -112,15 +141,14 @@ class ResultService(metaclass=SingletonMeta):
         """
         returns the max coverage by strategy name
         """
-        executions_by_contract_name = self._read_results_file(strategy)
+        table = self._get_metrics_table(strategy)
 
         coverage_by_contract_name = self._init_result_dict(contracts)
         for contract in contracts:
-            contract_name = contract["file"]
-            coverage_by_contract_name[contract_name] = self._get_executions_average_coverage(
-                executions_by_contract_name,
-                contract_name,
-                "averageCoverage",
+            contract_name = contract.file
+            coverage_by_contract_name[contract_name] = self._get_executions_mean(
+                table.get(strategy, contract_name),
+                lambda metrics: metrics.average_coverage,
             )
 
         sucessful_runs = [
@@ -136,14 +164,14 @@ class ResultService(metaclass=SingletonMeta):
         """
         returns the critical instructions by strategy name
         """
-        executions_by_contract_name = self._read_results_file(strategy)
+        table = self._get_metrics_table(strategy)
 
         hits_by_contract_name = self._init_result_dict(contracts)
         for contract in contracts:
-            contract_name = contract["file"]
-            hits_by_contract_name[contract_name] = self._get_executions_hits_average(
-                executions_by_contract_name,
-                contract_name,
+            contract_name = contract.file
+            hits_by_contract_name[contract_name] = self._get_executions_mean(
+                table.get(strategy, contract_name),
+                lambda metrics: metrics.critical_instructions_hits,
             )
 
         successful_executions = [
@@ -155,187 +183,17 @@ class ResultService(metaclass=SingletonMeta):
             hits_sum / successful_executions) if successful_executions > 0 else -1
         return (hits_by_contract_name, average_hits)
 
-    def get_vulnerabilities_count(
-        self,
-        contracts: list,
-        vulnerabilities: list
-    ) -> dict:
-        
-        pre_categorized_vulnerabilities = self._init_pre_categorized_vulnerabilities(
-            contracts,
-            vulnerabilities,
-        )
-        return pre_categorized_vulnerabilities
-
-
-    def get_detection_alarms(
-        self,
-        strategy: str,
-        contracts: list,
-        vulnerabilities: list,
-        include_new_detections: bool = True,
-    ) -> map:
-        executions_by_contract_name = self._read_results_file(strategy)
-        
-        alarms_map = {}
-        for vulnerability in vulnerabilities:
-            alarms_map[vulnerability] = { "TP": 0, "FP": 0, "FN": 0 }
-    
-        vul_count = self.get_vulnerabilities_count(contracts, vulnerabilities)
-    
-    
-        for contract in contracts:
-            contract_name = contract["file"]
-            contract_vulnerabilities = contract["vulnerabilities"]
-
-            executions = executions_by_contract_name.get(contract_name, None)
-            if executions is None:
-                continue
-            for execution in executions:
-                detected_weaknesses = execution["execution"]["detectedWeaknesses"]
-                for vulnerability in vulnerabilities:
-                    if vulnerability in detected_weaknesses and vulnerability in contract_vulnerabilities:
-                        alarms_map[vulnerability]["TP"] += 1
-                    elif vulnerability in detected_weaknesses and vulnerability not in contract_vulnerabilities:
-                        alarms_map[vulnerability]["FP"] += 1
-
-        for vulnerability in vulnerabilities:
-            alarms_map[vulnerability]["FN"] = vul_count[vulnerability] - alarms_map[vulnerability]["TP"]
-
-        return alarms_map
-
-
-    def get_detection_rate_by_strategy(
-        self,
-        strategy: str,
-        contracts: list,
-        vulnerabilities: list,
-        include_new_detections: bool = True,
-    ) -> map:
-        """
-        return the vulnerability detection rate by strategy name
-        """
-        executions_by_contract_name = self._read_results_file(strategy)
-        
-        pre_categorized_vulnerabilities = self._init_pre_categorized_vulnerabilities(
-            contracts,
-            vulnerabilities,
-        )
-
-        detection_rate = {}
-        for vulnerability in vulnerabilities:
-            detection_rate[vulnerability] = 0
-
-        for contract in contracts:
-            contract_name = contract["file"]
-            contract_vulnerabilities = contract["vulnerabilities"]
-
-            executions = executions_by_contract_name.get(contract_name, None)
-            if executions is None:
-                continue
-            for execution in executions:
-                detected_weaknesses = execution["execution"]["detectedWeaknesses"]
-                for weakness in detected_weaknesses:
-                    if weakness in vulnerabilities \
-                            and (include_new_detections or weakness in contract_vulnerabilities):
-                        detection_rate[weakness] += 1
-
-        for vulnerability in detection_rate:
-            if vulnerability in vulnerabilities:
-                if include_new_detections and pre_categorized_vulnerabilities[vulnerability] == 0:
-                    detection_rate[vulnerability] = (0, detection_rate[vulnerability])
-                elif pre_categorized_vulnerabilities[vulnerability] == 0:
-                    detection_rate[vulnerability] = (0, 0)
-                else:
-                    detection_rate[vulnerability] = (detection_rate[vulnerability] / \
-                        pre_categorized_vulnerabilities[vulnerability], detection_rate[vulnerability])
-
-        return detection_rate
-
-
-    def get_detection_by_strategy_csv(
-        self,
-        strategy: str,
-        contracts: list,
-    ) -> map:
-        """
-        return the vulnerability detection rate by strategy name
-        """
-        executions_by_contract_name = self._read_results_file(strategy)
-        detection = []
-
-        for contract in contracts:
-            contract_name = contract["file"]
-            executions = executions_by_contract_name.get(contract_name, None)
-            for execution in executions:
-                time_to_weaknesses_dict = execution["execution"]["timeToWeaknesses"]   
-                for weakness,time in time_to_weaknesses_dict.items():
-                    detection.append((contract_name, weakness,str(time)))
-        return detection
-
-
-
-    def get_detection_by_strategy(
-        self,
-        strategy: str,
-        contracts: list,
-        vulnerabilities: list
-    ) -> map:
-        """
-        return the vulnerability detection rate by strategy name
-        """
-        executions_by_contract_name = self._read_results_file(strategy)
-        detection = {}
-        for vulnerability in vulnerabilities:
-            detection[vulnerability] = []
-
-        time_map_list = []
-        time_map = {}
-        for contract in contracts:
-            contract_name = contract["file"]
-            contract_vulnerabilities = contract["vulnerabilities"]
-
-            for vulnerability in contract_vulnerabilities:
-                executions = executions_by_contract_name.get(contract_name, None)
-
-                if executions is None or len(executions) == 0:
-                    detection[vulnerability].append("Never found " + map_vulnerability_smartian_to_long_name(vulnerability) + " from " + contract_name)
-                    break
-                for execution in executions:
-                    detected_weaknesses = execution["execution"]["detectedWeaknesses"]
-                    if vulnerability in detected_weaknesses:
-                        time_to_weaknesses = execution["execution"]["timeToWeaknesses"]
-                        filterd_times = {key: value for key, value in time_to_weaknesses.items() if is_smartian_type(vulnerability, key)}
-                        _, min_time = min(filterd_times.items(), key=lambda x: x[1])
-                        detection[vulnerability].append("Fully found " + map_vulnerability_smartian_to_long_name(vulnerability) + " from " + contract_name + " [" + str(min_time) + "] sec")
-                        time_map[(contract_name, map_vulnerability_smartian_to_long_name(vulnerability))] = min_time
-                    else:
-                        detection[vulnerability].append("Never found " + map_vulnerability_smartian_to_long_name(vulnerability) + " from " + contract_name)
-        if time_map:
-            time_map_list.append(time_map)
-        return detection, time_map_list
-
     def get_transaction_count_by_strategy(self, strategy: str, contracts: list) -> float:
         """return the number of executions by strategy name
         """
-        executions_by_contract_name = self._read_results_file(strategy)
-
-        average_transaction_count = 0
-        execution_count = 0
-        for contract in contracts:
-            contract_name = contract["file"]
-            executions = executions_by_contract_name.get(contract_name, None)
-            if executions is None:
-                continue
-            execution_count += len(executions)
-            for execution in executions:
-                transaction_count = len(
-                    execution["execution"]["coverageByTime"]["x"])
-                average_transaction_count += transaction_count
+        table = self._get_metrics_table(strategy)
 
-        if execution_count == 0:
+        transaction_count = RunningStats.merge_all(
+            table.get(strategy, contract.file).transaction_count for contract in contracts
+            if table.get(strategy, contract.file) is not None)
+        if transaction_count.count == 0:
             return -1
-        return float(average_transaction_count) / float(execution_count)
+        return transaction_count.mean
 
 
 
@@ -343,41 +201,67 @@ class ResultService(metaclass=SingletonMeta):
         self,
         strategy: str,
         contracts: list,
+        time_frame_in_seconds: int = 300,
+        upper_limit_in_seconds: int = 3600,
     ) -> map:
-        executions_by_contract_name = self._read_results_file(strategy)
+        """return the instruction coverage by contract, sampled every time frame
+        up to the upper limit (keyed by seconds since the first transaction)
+        """
+        executions_by_contract_name = self._read_results_file(strategy, ["coverageByTime", "instructionIndex"])
 
         contract_instruction_coverage = {}
         for contract in contracts:
-            contract_name = contract["file"]
+            contract_name = contract.file
             executions = executions_by_contract_name.get(contract_name, None)
             if executions is None:
                 continue
-            for execution in executions:
-                heat_map = execution["execution"]["instructionHitsHeatMap"]
-                filtered_heat_map = {key: value for key, value in heat_map.items() if value > 0}
-                
-                # Load time series of coverage by edge
-                timestamps = [parser.isoparse(timestamp) for timestamp in execution["execution"]["coverageByTime"]["x"]]
-                coverage_value = execution["execution"]["coverageByTime"]["y"]
-                total_blocks = execution["execution"]["totalInstructions"]
+            for covered_instructions, heat_map_size, timestamps, coverage_value in _iter_timelines(executions):
                 # Get the ratio from edge to instruction coverage
                 edge_to_instruction_ratio = 1
-                if filtered_heat_map and coverage_value:
-                    edge_to_instruction_ratio = len(filtered_heat_map) / int(max(coverage_value))
-                    
-                query_time = min(timestamps)
-                index = 0
+                if covered_instructions > 0 and coverage_value:
+                    edge_to_instruction_ratio = covered_instructions / int(max(coverage_value))
+
+                offsets, indexes = sample_indexes(
+                    timestamps, time_frame_in_seconds, upper_limit_in_seconds)
                 coverage_over_time = {0: 0}
-                for minute in range(5, 60 + 5, 5):
-                    query_time = query_time + timedelta(minutes=5)
-                    try:
-                        index = next(i for i, dt in enumerate(timestamps) if dt > query_time)
-                    except StopIteration:
-                        pass
-                    coverage_over_time[minute] = coverage_value[index] * edge_to_instruction_ratio
-                contract_instruction_coverage[contract_name] = len(filtered_heat_map), len(filtered_heat_map) / len(heat_map) * 100, coverage_over_time
+                for offset, index in zip(offsets.tolist(), indexes.tolist()):
+                    coverage_over_time[offset] = coverage_value[index] * edge_to_instruction_ratio
+                contract_instruction_coverage[contract_name] = covered_instructions, \
+                    covered_instructions / heat_map_size * 100, coverage_over_time
         return contract_instruction_coverage
 
+    def get_coverage_matrix(
+        self,
+        strategy: str,
+        time_frame_in_seconds: int = 60,
+        upper_limit_in_seconds: int = 3600,
+    ) -> CoverageMatrix:
+        """returns the instruction coverage over time of every execution of the
+        strategy, resampled every time frame up to the upper limit, as a runs x
+        time matrix labeled by contract name. The matrix is kept until other
+        results are loaded
+        """
+        cache_key = (strategy, time_frame_in_seconds, upper_limit_in_seconds)
+        if cache_key in self._coverage_matrix_cache:
+            return self._coverage_matrix_cache[cache_key]
+
+        executions_by_contract_name = self._read_results_file(strategy, ["coverageByTime", "instructionIndex"])
+        grid = np.arange(0, upper_limit_in_seconds + time_frame_in_seconds, time_frame_in_seconds)
+        rows, labels = [], []
+        for contract_name, executions in executions_by_contract_name.items():
+            for covered_instructions, _, epochs, coverage_value in _iter_timelines(executions):
+                # the edge coverage is scaled to the instruction coverage, like get_instructions_coverage
+                edge_to_instruction_ratio = 1
+                if covered_instructions > 0 and coverage_value:
+                    edge_to_instruction_ratio = covered_instructions / int(max(coverage_value))
+                times = (np.asarray(epochs) - (epochs[0] if len(epochs) > 0 else 0)) / MICROSECONDS_PER_SECOND
+                rows.append(resample(times, coverage_value, grid) * edge_to_instruction_ratio)
+                labels.append(contract_name)
+
+        coverage_matrix = CoverageMatrix(grid, np.array(rows).reshape(len(rows), len(grid)), labels)
+        self._coverage_matrix_cache[cache_key] = coverage_matrix
+        return coverage_matrix
+
     def get_hits_by_instructions_and_strategy(
         self,
         strategy: str,
@@ -386,28 +270,18 @@ class ResultService(metaclass=SingletonMeta):
     ) -> map:
         """return the number of hits by instruction and strategy name
         """
-        executions_by_contract_name = self._read_results_file(strategy)
+        table = self._get_metrics_table(strategy)
 
         hits = {}
         for critical_instruction in critical_instructions:
             hits[critical_instruction] = 0
 
         for contract in contracts:
-            contract_name = contract["file"]
-            executions = executions_by_contract_name.get(contract_name, None)
-            if executions is None:
+            metrics = table.get(strategy, contract.file)
+            if metrics is None:
                 continue
-            for execution in executions:
-                for critical_instruction in critical_instructions:
-                    instructions = execution["execution"]["instructions"]
-                    critical_instruction_pcs = []
-                    for instruction_pc in instructions:
-                        if instructions[instruction_pc] == critical_instruction:
-                            critical_instruction_pcs.append(instruction_pc)
-
-                    heat_map = execution["execution"]["instructionHitsHeatMap"]
-                    for program_counter in critical_instruction_pcs:
-                        hits[critical_instruction] += heat_map[program_counter]
+            for critical_instruction in critical_instructions:
+                hits[critical_instruction] += metrics.hits_by_instruction.get(critical_instruction, 0)
 
         transactions_count = self.get_transaction_count_by_strategy(
             strategy, contracts)
@@ -419,76 +293,264 @@ class ResultService(metaclass=SingletonMeta):
             return (hits, -1)
         return (hits, sum(hits.values()) / len(hits))
 
-    def _init_pre_categorized_vulnerabilities(self, contracts: list, vulnerabilities: list):
-        pre_categorized_vulnerabilities = {}
-        for vulnerability in vulnerabilities:
-            pre_categorized_vulnerabilities[vulnerability] = 0
-
-        for contract in contracts:
-            for vulnerability in contract["vulnerabilities"]:
-                if vulnerability not in pre_categorized_vulnerabilities:
-                    pre_categorized_vulnerabilities[vulnerability] = 0
-                pre_categorized_vulnerabilities[vulnerability] += 1
-        return pre_categorized_vulnerabilities
-
-    def _read_results_file(self, strategy: str) -> map:
-        results_folder = os.path.join(
-            self._config.temp_folder, self._config.results_dir)
-        strategy_result_folder = os.path.join(
-            results_folder, f"{strategy}_fuzzing")
-        if not os.path.exists(strategy_result_folder):
-            strategy_result_folder = results_folder
-
-        executions_by_contract_name = {}
-        for path in os.listdir(strategy_result_folder):
-            with open(os.path.join(strategy_result_folder, path), 'r', encoding='utf-8') as file:
-                content = file.read()
-                results_content = json.loads(content)
-                for contract_name in results_content.keys():
-                    try:
-                        executions = results_content[contract_name][strategy]
-                    except KeyError:
-                        break
-                    successful_executions = self._filter_successful_executions(
-                        executions)
+    def _read_results_file(self, strategy: str, fields: list = None) -> map:
+        fields = frozenset(EXECUTION_FIELDS if fields is None else fields) | {"totalInstructions"}
+        executions_by_contract_name = self._parse_results_file(strategy, fields)
+        if not self._for_smartian:
+            return executions_by_contract_name
+
+        cache_key = (strategy, fields)
+        if cache_key not in self._smartian_cache:
+            self._smartian_cache[cache_key] = {
+                contract_name: executions.to_smartian() if isinstance(executions, ExecutionColumns)
+                else [self._to_smartian_execution(execution) for execution in executions]
+                for contract_name, executions in executions_by_contract_name.items()
+            }
+        return self._smartian_cache[cache_key]
+
+    def _parse_results_file(self, strategy: str, fields: frozenset) -> map:
+        if self._compiled_results is not None:
+            cache_key = (self._compiled_results.path, strategy)
+            executions_by_contract_name = self._get_cached_executions(cache_key, fields)
+            if executions_by_contract_name is None:
+                executions_by_contract_name = self._compiled_results.get_execution_columns(strategy, fields)
+                self._executions_cache[(cache_key, fields)] = executions_by_contract_name
+            return executions_by_contract_name
+
+        results_archive = self._results_archive
+        if results_archive is None:
+            raise ResultsNotFoundException(
+                "the results were not loaded yet. Please provide the experiment folder")
+        strategy_result_folder = self._get_strategy_result_folder(strategy)
+
+        cache_key = (results_archive.path, strategy_result_folder, strategy)
+        executions_by_contract_name = self._get_cached_executions(cache_key, fields)
+        if executions_by_contract_name is not None:
+            return executions_by_contract_name
+
+        # every strategy stored in the same folder is taken from a single decode of its files
+        strategies = [x for x in FUZZING_TYPES
+                      if self._get_strategy_result_folder(x) == strategy_result_folder]
+        if strategy not in strategies:
+            strategies.append(strategy)
+
+        members = results_archive.list_members(strategy_result_folder)
+        workers = min(self._config.workers, len(members))
+        if workers > 1:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_results_worker,
+                initargs=(results_archive.path,),
+            ) as executor:
+                members_executions = list(executor.map(
+                    _read_results_member_in_worker, members, repeat(strategies), repeat(fields)))
+        else:
+            members_executions = [_read_results_member(
+                results_archive, member, strategies, fields) for member in members]
+
+        for member_strategy in strategies:
+            executions_by_contract_name = {}
+            for member_executions in members_executions:
+                for contract_name, successful_executions in member_executions[member_strategy]:
                     executions_by_contract_name[contract_name] = successful_executions
-        return executions_by_contract_name
+            self._executions_cache[((results_archive.path, strategy_result_folder, member_strategy), fields)] = \
+                executions_by_contract_name
+        return self._executions_cache[(cache_key, fields)]
+
+    def get_results_source(self) -> dict:
+        """
+        returns the file name and the sha256 of the loaded results zip
+        """
+        if self._compiled_results is not None:
+            return {
+                "file": self._compiled_results.source["file"],
+                "sha256": self._compiled_results.source["sha256"],
+            }
+        if self._results_archive is None:
+            raise ResultsNotFoundException(
+                "the results were not loaded yet. Please provide the experiment folder")
+        return {
+            "file": os.path.basename(self._results_archive.path),
+            "sha256": file_digest(self._results_archive.path),
+        }
+
+    def _group_strategies_by_folder(self, strategies: list, fields: frozenset) -> list:
+        """groups the strategies whose results files must be streamed by result
+        folder, the others are grouped under None
+        """
+        if self._compiled_results is not None or self._config.workers > 1:
+            return [(None, strategies)]
+        if self._results_archive is None:
+            raise ResultsNotFoundException(
+                "the results were not loaded yet. Please provide the experiment folder")
+
+        strategies_by_folder = {}
+        for strategy in strategies:
+            strategy_result_folder = self._get_strategy_result_folder(strategy)
+            cache_key = (self._results_archive.path, strategy_result_folder, strategy)
+            if self._get_cached_executions(cache_key, fields) is not None:
+                strategy_result_folder = None
+            strategies_by_folder.setdefault(strategy_result_folder, []).append(strategy)
+        return list(strategies_by_folder.items())
+
+    def _get_cached_executions(self, cache_key: tuple, fields: frozenset) -> map:
+        """returns the cached executions parsed with at least the requested fields
+        """
+        for (cached_key, cached_fields), executions_by_contract_name in self._executions_cache.items():
+            if cached_key == cache_key and fields <= cached_fields:
+                return executions_by_contract_name
+        return None
 
-    def _filter_successful_executions(self, executions):
-        filtered_executions = []
-        for execution in executions:
-            if execution["status"] == "success" and execution["execution"]["totalInstructions"] > 0:
-                filtered_executions.append(execution)
-        return filtered_executions
+    def _get_results_zip_file_path(self, results_folder_name: str) -> str:
+        clean_results_folder_name = results_folder_name.rstrip('/')
+        return os.path.join(
+            self._config.results_folder, clean_results_folder_name, f"{clean_results_folder_name}.zip")
+
+    def _get_compiled_results_folder(self, results_folder_name: str) -> str:
+        return os.path.join(
+            self._config.results_folder, results_folder_name.rstrip('/'), COMPILED_RESULTS_FOLDER)
+
+    def _close_results(self):
+        """closes the loaded results, so the next read reflects the results loaded next
+        """
+        if self._results_archive is not None:
+            self._results_archive.close()
+        self._results_archive = None
+        self._compiled_results = None
+        self._for_smartian = False
+        self._clear_executions_cache()
+
+    def _get_strategy_result_folder(self, strategy: str) -> str:
+        strategy_result_folder = f"{strategy}_fuzzing"
+        if not self._results_archive.has_folder(strategy_result_folder):
+            strategy_result_folder = ""
+        return strategy_result_folder
+
+    def _to_smartian_execution(self, execution: dict) -> dict:
+        """returns a shallow copy of the execution with the detected weaknesses
+        in the smartian standard, the parsed execution is left untouched
+        """
+        if "detectedWeaknesses" not in execution["execution"]:
+            return execution
+        detected_weaknesses = map_weaknesses_to_smartian_standard(execution["execution"]["detectedWeaknesses"])
+        return {
+            **execution,
+            "execution": {**execution["execution"], "detectedWeaknesses": detected_weaknesses},
+        }
+
+    def _clear_executions_cache(self):
+        """drops the parsed executions, so the next read reflects the loaded results
+        """
+        self._executions_cache = {}
+        self._smartian_cache = {}
+        self._coverage_matrix_cache = {}
+        self._metrics_table_cache = {}
 
     def _init_result_dict(self, contracts: list):
         value = {}
         for contract in contracts:
-            contract_name = contract["file"]
+            contract_name = contract.file
             if contract_name not in value:
                 value[contract_name] = 0
         return value
 
-    def _get_executions_average_coverage(
-        self,
-        executions: map,
-        contract_name: str,
-        coverage_type: str
-    ) -> float:
-        if contract_name not in executions or len(executions[contract_name]) == 0:
+    def _get_metrics_table(self, strategy: str) -> MetricsTable:
+        """returns the aggregates of the executions of every strategy, taken in
+        a single pass over the results files and kept until other results are
+        loaded, so the per strategy getters never read the results again
+        """
+        strategies = tuple(FUZZING_TYPES if strategy in FUZZING_TYPES else [strategy])
+        if strategies not in self._metrics_table_cache:
+            table = MetricsTable()
+            for table_strategy, contract_name, executions in self.iter_executions(strategies, AGGREGATED_FIELDS):
+                table.add_contract_executions(table_strategy, contract_name, executions)
+            self._metrics_table_cache[strategies] = table
+        return self._metrics_table_cache[strategies]
+
+    def _get_executions_mean(self, metrics: ContractMetrics, get_stats) -> float:
+        if metrics is None or get_stats(metrics).count == 0:
             return -1
+        return get_stats(metrics).mean
+
+
+_worker_results_archive = None
+
+
+def _init_results_worker(results_zip_file_path: str):
+    global _worker_results_archive
+    _worker_results_archive = ZipArchive(results_zip_file_path)
+
+
+def _read_results_member_in_worker(member: str, strategies: list, fields: frozenset) -> map:
+    return _read_results_member(_worker_results_archive, member, strategies, fields)
+
+
+def _read_results_member(results_archive: ZipArchive, member: str, strategies: list, fields: frozenset) -> map:
+    """returns the successful executions of each strategy in a results file as
+    (contract name, executions) pairs
+    """
+    executions_by_strategy = {strategy: [] for strategy in strategies}
+    for strategy, contract_name, executions in _iter_results_member(results_archive, member, strategies, fields):
+        executions_by_strategy[strategy].append((contract_name, list(executions)))
+    return executions_by_strategy
+
+
+def _iter_results_member(results_archive: ZipArchive, member: str, strategies: list, fields: frozenset):
+    """streams a results file and yields (strategy, contract name, executions)
+    records, where the successful executions are decoded while they are
+    iterated and keep only the requested fields. A strategy stops being read
+    at the first contract without it
+    """
+    missing_strategies = set()
+    with io.TextIOWrapper(results_archive.open(member), encoding="utf-8") as file:
+        results_stream = ResultsStream(file, partial(_project_execution, fields))
+        for contract_name, contract_strategies in results_stream.iter_contracts():
+            found_strategies = set()
+            for strategy, executions in contract_strategies:
+                if strategy not in strategies or strategy in missing_strategies:
+                    continue
+                found_strategies.add(strategy)
+                yield strategy, contract_name, filter(_is_successful_execution, executions)
+            missing_strategies.update(
+                strategy for strategy in strategies if strategy not in found_strategies)
+
+
+def _project_execution(fields: frozenset, value: dict) -> dict:
+    """object hook that drops the execution fields which were not requested
+    while the results file is decoded. The coverageByTime timestamps are
+    decoded into an "epochs" array of microseconds and the heat map is
+    indexed by opcode into an "instructionIndex", so neither the timestamps
+    nor the heat map outlive their execution
+    """
+    if "totalInstructions" not in value:
+        return value
 
-        coverage_sum = 0
-        for execution in executions[contract_name]:
-            coverage = execution["execution"][coverage_type]
-            total_instructions = execution["execution"]["totalInstructions"]
-            coverage_sum += coverage / total_instructions
-        return coverage_sum / len(executions[contract_name])
-
-    def _get_executions_hits_average(self, executions: map, contract_name: str) -> float:
-        if contract_name not in executions or len(executions[contract_name]) == 0:
-            return -1
-        hits = 0
-        for execution in executions[contract_name]:
-            hits += execution["execution"]["criticalInstructionsHits"]
-        return hits / len(executions[contract_name])
+    execution = {field: value[field] for field in fields if field in value}
+    if value["totalInstructions"] > 0:
+        if "coverageByTime" in fields:
+            execution["coverageByTime"] = {
+                "epochs": decode_timestamps(value["coverageByTime"]["x"]),
+                "y": value["coverageByTime"]["y"],
+            }
+        if "instructionIndex" in fields:
+            execution["instructionIndex"] = InstructionIndex(
+                value["instructions"], value["instructionHitsHeatMap"])
+    return execution
+
+
+def _iter_timelines(executions):
+    """yields the covered instructions, the heat map size, the epochs and the
+    coverage values of the coverageByTime of every execution
+    """
+    if isinstance(executions, ExecutionColumns):
+        yield from executions.iter_timelines()
+        return
+    for execution in executions:
+        instruction_index = execution["execution"]["instructionIndex"]
+        coverage_by_time = execution["execution"]["coverageByTime"]
+        yield instruction_index.covered_instructions, instruction_index.heat_map_size, \
+            coverage_by_time["epochs"], coverage_by_time["y"]
+
+
+def _is_successful_execution(execution: dict) -> bool:
+    return execution["status"] == "success" and execution["execution"]["totalInstructions"] > 0
@@ -0,0 +1,57 @@
+"""
+this module contains helpers to read the zip files without extracting them
+"""
+import hashlib
+import json
+import posixpath
+import zipfile
+
+
+def file_digest(file_path: str) -> str:
+    """returns the sha256 of the file content
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ZipArchive():
+    """read only access to the members of a zip file, streamed straight from the archive
+    """
+
+    def __init__(self, zip_file_path: str) -> None:
+        self.path = zip_file_path
+        self._zip_file = zipfile.ZipFile(zip_file_path, 'r')
+        self._members = [
+            info.filename for info in self._zip_file.infolist() if not info.is_dir()]
+
+    def has_folder(self, folder: str) -> bool:
+        """returns whether any member is inside the folder
+        """
+        prefix = folder.strip('/') + '/'
+        return any(member.startswith(prefix) for member in self._members)
+
+    def list_members(self, folder: str = "") -> list:
+        """lists the files directly inside the folder, like os.listdir
+        """
+        folder = folder.strip('/')
+        return [member for member in self._members
+                if posixpath.dirname(member) == folder]
+
+    def open(self, member: str):
+        """opens a member for binary reading
+        """
+        return self._zip_file.open(member, 'r')
+
+    def read_json(self, member: str, object_hook=None):
+        """decodes a json member, the object hook is called with every decoded object
+        """
+        with self.open(member) as file:
+            return json.load(file, object_hook=object_hook)
+
+    def close(self):
+        """closes the underlying zip file
+        """
+        self._zip_file.close()
@@ -0,0 +1,349 @@
+"""
+this module contains the columnar store of compiled results. The compile
+command writes the successful executions of an experiment as numpy columns,
+which the other commands memory map instead of decoding the results zip
+"""
+import json
+import os
+
+import numpy as np
+
+from aggregator.shared.archive import file_digest
+from aggregator.shared.instructions import InstructionIndex
+from aggregator.shared.utils import map_weakness_to_smartian_standard
+
+COMPILED_RESULTS_VERSION = 2
+DICTIONARY_FILE = "dictionary.json"
+
+# the weaknesses are stored as codes of this type, which bounds how many weakness types an experiment may have
+WEAKNESS_CODE_DTYPE = np.uint16
+MAX_WEAKNESS_CODES = int(np.iinfo(WEAKNESS_CODE_DTYPE).max) + 1
+
+_SCALAR_COLUMNS = {
+    "maxCoverage": "max_coverage",
+    "averageCoverage": "average_coverage",
+    "totalInstructions": "total_instructions",
+    "criticalInstructionsHits": "critical_instructions_hits",
+}
+
+
+def write_compiled_results(folder: str, results_zip_file_path: str, executions_by_strategy: map):
+    """writes the executions of every strategy, by contract name, into a new
+    compiled results folder
+    """
+    strategies = list(executions_by_strategy.keys())
+    contracts, contract_codes = [], {}
+    weaknesses, weakness_codes = [], {}
+    opcodes, opcode_codes = [], {}
+    groups = []
+    executions = []
+    for strategy_code, strategy in enumerate(strategies):
+        for contract_name, contract_executions in executions_by_strategy[strategy].items():
+            if contract_name not in contract_codes:
+                contract_codes[contract_name] = len(contracts)
+                contracts.append(contract_name)
+            groups.append((strategy_code, contract_codes[contract_name], len(executions)))
+            for execution in contract_executions:
+                execution = execution["execution"]
+                for weakness in [*execution["detectedWeaknesses"], *execution["timeToWeaknesses"].keys()]:
+                    if weakness not in weakness_codes:
+                        weakness_codes[weakness] = len(weaknesses)
+                        weaknesses.append(weakness)
+                for opcode in execution["instructionIndex"].opcodes:
+                    if opcode not in opcode_codes:
+                        opcode_codes[opcode] = len(opcodes)
+                        opcodes.append(opcode)
+                executions.append(execution)
+
+    if len(weaknesses) > MAX_WEAKNESS_CODES:
+        raise ValueError(
+            f"the results have {len(weaknesses)} weakness types, "
+            f"the compiled results support up to {MAX_WEAKNESS_CODES}")
+
+    columns = {
+        "group_strategy": np.array([x[0] for x in groups], dtype=np.int64),
+        "group_contract": np.array([x[1] for x in groups], dtype=np.int64),
+        "group_offsets": np.array([x[2] for x in groups] + [len(executions)], dtype=np.int64),
+        "max_coverage": np.array([x["maxCoverage"] for x in executions]),
+        "average_coverage": np.array([x["averageCoverage"] for x in executions]),
+        "total_instructions": np.array([x["totalInstructions"] for x in executions]),
+        "critical_instructions_hits": np.array([x["criticalInstructionsHits"] for x in executions]),
+        "heat_map_size": np.array(
+            [x["instructionIndex"].heat_map_size for x in executions], dtype=np.int64),
+        "covered_instructions": np.array(
+            [x["instructionIndex"].covered_instructions for x in executions], dtype=np.int64),
+    }
+
+    opcode_hits = np.zeros((len(executions), len(opcodes)), dtype=np.int64)
+    for row, execution in enumerate(executions):
+        instruction_index = execution["instructionIndex"]
+        opcode_hits[row, [opcode_codes[x] for x in instruction_index.opcodes]] = instruction_index.hits_by_opcode
+    columns["opcode_hits"] = opcode_hits
+
+    # the weaknesses of every execution are kept in order, duplicates included,
+    # as the slice of a codes column between two offsets
+    columns["detected_weaknesses_offsets"], columns["detected_weaknesses_codes"] = _to_offsets_and_codes(
+        [[weakness_codes[x] for x in execution["detectedWeaknesses"]] for execution in executions])
+    columns["time_to_weaknesses_offsets"], columns["time_to_weaknesses_codes"] = _to_offsets_and_codes(
+        [[weakness_codes[x] for x in execution["timeToWeaknesses"]] for execution in executions])
+    # the times keep the integer dtype of dogefuzz unless any of them is fractional
+    columns["time_to_weaknesses_times"] = np.array(
+        [time for execution in executions for time in execution["timeToWeaknesses"].values()])
+
+    timeline_lengths = [len(x["coverageByTime"]["epochs"]) for x in executions]
+    columns["timeline_offsets"] = np.concatenate(
+        [[0], np.cumsum(timeline_lengths, dtype=np.int64)]).astype(np.int64)
+    columns["timeline_epochs"] = np.concatenate(
+        [np.empty(0, dtype=np.int64)] + [x["coverageByTime"]["epochs"] for x in executions])
+    columns["timeline_coverage"] = np.array(
+        [value for x in executions for value in x["coverageByTime"]["y"]])
+
+    results_zip_stat = os.stat(results_zip_file_path)
+    dictionary = {
+        "version": COMPILED_RESULTS_VERSION,
+        "source": {
+            "file": os.path.basename(results_zip_file_path),
+            "size": results_zip_stat.st_size,
+            "mtime": results_zip_stat.st_mtime_ns,
+            "sha256": file_digest(results_zip_file_path),
+        },
+        "strategies": strategies,
+        "contracts": contracts,
+        "weaknesses": weaknesses,
+        "opcodes": opcodes,
+    }
+
+    os.makedirs(folder)
+    for name, column in columns.items():
+        np.save(os.path.join(folder, f"{name}.npy"), column)
+    with open(os.path.join(folder, DICTIONARY_FILE), 'w') as file:
+        json.dump(dictionary, file)
+
+
+def _to_offsets_and_codes(codes_by_row: list):
+    offsets = np.zeros(len(codes_by_row) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(codes) for codes in codes_by_row], dtype=np.int64)
+    codes = np.fromiter(
+        (code for row_codes in codes_by_row for code in row_codes), dtype=WEAKNESS_CODE_DTYPE, count=int(offsets[-1]))
+    return offsets, codes
+
+
+class CompiledResults():
+    """read only access to a compiled results folder, every column is memory
+    mapped the first time it is used
+    """
+
+    def __init__(self, folder: str) -> None:
+        self.path = folder
+        with open(os.path.join(folder, DICTIONARY_FILE), 'r') as file:
+            dictionary = json.load(file)
+        if dictionary["version"] != COMPILED_RESULTS_VERSION:
+            raise ValueError(
+                f"the compiled results in {folder} have version {dictionary['version']}, "
+                f"please compile the experiment again")
+        self.source = dictionary["source"]
+        self.strategies = dictionary["strategies"]
+        self.contracts = dictionary["contracts"]
+        self.weaknesses = dictionary["weaknesses"]
+        self.opcodes = dictionary["opcodes"]
+        self._columns = {}
+
+    @staticmethod
+    def exists(folder: str) -> bool:
+        """returns whether the folder holds compiled results
+        """
+        return os.path.isfile(os.path.join(folder, DICTIONARY_FILE))
+
+    def is_compiled_from(self, results_zip_file_path: str) -> bool:
+        """returns whether the results were compiled from the zip as it is now,
+        the zip is only hashed when its modification time changed
+        """
+        results_zip_stat = os.stat(results_zip_file_path)
+        if results_zip_stat.st_size != self.source["size"]:
+            return False
+        if results_zip_stat.st_mtime_ns == self.source["mtime"]:
+            return True
+        return file_digest(results_zip_file_path) == self.source["sha256"]
+
+    def column(self, name: str):
+        """returns a memory mapped column
+        """
+        if name not in self._columns:
+            self._columns[name] = np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode='r')
+        return self._columns[name]
+
+    def get_execution_columns(self, strategy: str, fields: list) -> map:
+        """returns the executions of a strategy by contract name, as views over
+        the rows of the contract in the columns of the requested fields
+        """
+        if strategy not in self.strategies:
+            return {}
+        strategy_code = self.strategies.index(strategy)
+        group_offsets = self.column("group_offsets")
+        groups = np.flatnonzero(self.column("group_strategy") == strategy_code)
+
+        executions_by_contract_name = {}
+        group_contracts = self.column("group_contract")[groups].tolist()
+        for group, contract_code in zip(groups.tolist(), group_contracts):
+            executions_by_contract_name[self.contracts[contract_code]] = ExecutionColumns(
+                self, int(group_offsets[group]), int(group_offsets[group + 1]), fields)
+        return executions_by_contract_name
+
+    def read_field(self, field: str, first_row: int, last_row: int) -> list:
+        """returns the values of an execution field for the rows, shaped like
+        the parsed results files
+        """
+        rows = slice(first_row, last_row)
+        if field in _SCALAR_COLUMNS:
+            return self.column(_SCALAR_COLUMNS[field])[rows].tolist()
+
+        if field == "detectedWeaknesses":
+            offsets, codes = self.read_codes("detected_weaknesses", first_row, last_row)
+            return [
+                [self.weaknesses[code] for code in codes[start:end]]
+                for start, end in zip(offsets[:-1], offsets[1:])
+            ]
+
+        if field == "timeToWeaknesses":
+            offsets, codes = self.read_codes("time_to_weaknesses", first_row, last_row)
+            times = self.read_times(first_row, last_row).tolist()
+            return [
+                {self.weaknesses[code]: time for code, time in zip(codes[start:end], times[start:end])}
+                for start, end in zip(offsets[:-1], offsets[1:])
+            ]
+
+        if field == "coverageByTime":
+            return [{"epochs": epochs, "y": coverage} for epochs, coverage in self.read_timelines(first_row, last_row)]
+
+        if field == "instructionIndex":
+            return [
+                InstructionIndex.from_opcode_hits(self.opcodes, hits, heat_map_size, covered_instructions)
+                for hits, heat_map_size, covered_instructions in zip(
+                    self.column("opcode_hits")[rows],
+                    self.column("heat_map_size")[rows].tolist(),
+                    self.column("covered_instructions")[rows].tolist(),
+                )
+            ]
+
+        raise ValueError(f"the compiled results have no execution field {field}")
+
+    def read_codes(self, name: str, first_row: int, last_row: int):
+        """returns the offsets, starting at 0, and the codes of the rows in a
+        column of weakness codes
+        """
+        offsets = self.column(f"{name}_offsets")[first_row:last_row + 1]
+        codes = self.column(f"{name}_codes")[offsets[0]:offsets[-1]]
+        return (offsets - offsets[0]).tolist(), codes.tolist()
+
+    def read_times(self, first_row: int, last_row: int):
+        """returns the times of the timeToWeaknesses entries of the rows, in
+        the order of their codes
+        """
+        offsets = self.column("time_to_weaknesses_offsets")
+        return self.column("time_to_weaknesses_times")[offsets[first_row]:offsets[last_row]]
+
+    def read_timelines(self, first_row: int, last_row: int) -> list:
+        """returns the (epochs, coverage) time series of the rows
+        """
+        timeline_offsets = self.column("timeline_offsets")[first_row:last_row + 1].tolist()
+        timeline_epochs = self.column("timeline_epochs")
+        timeline_coverage = self.column("timeline_coverage")
+        return [
+            (timeline_epochs[start:end], timeline_coverage[start:end].tolist())
+            for start, end in zip(timeline_offsets[:-1], timeline_offsets[1:])
+        ]
+
+
+class ExecutionColumns():
+    """the executions of a contract for one strategy, as a view over its rows
+    in the compiled columns. The aggregates are computed on the columns at
+    once, iterating the view yields the executions shaped like the parsed
+    results files for the consumers walking them one at a time
+    """
+
+    def __init__(
+        self,
+        compiled_results: CompiledResults,
+        first_row: int,
+        last_row: int,
+        fields: list,
+        for_smartian: bool = False,
+    ) -> None:
+        self.fields = frozenset(fields)
+        self._compiled_results = compiled_results
+        self._first_row = first_row
+        self._last_row = last_row
+        self._for_smartian = for_smartian
+
+    def __len__(self) -> int:
+        return self._last_row - self._first_row
+
+    def __iter__(self):
+        values_by_field = {
+            field: self._compiled_results.read_field(field, self._first_row, self._last_row) for field in self.fields}
+        if self._for_smartian and "detectedWeaknesses" in values_by_field:
+            values_by_field["detectedWeaknesses"] = [
+                sorted({x for x in map(map_weakness_to_smartian_standard, weaknesses) if x is not None})
+                for weaknesses in values_by_field["detectedWeaknesses"]]
+        for row in range(len(self)):
+            yield {"status": "success", "execution": {field: values[row] for field, values in values_by_field.items()}}
+
+    def to_smartian(self) -> "ExecutionColumns":
+        """returns the view with the detected weaknesses in the smartian standard
+        """
+        return ExecutionColumns(self._compiled_results, self._first_row, self._last_row, self.fields, True)
+
+    def column(self, field: str):
+        """returns the values of a numeric execution field
+        """
+        return self._compiled_results.column(_SCALAR_COLUMNS[field])[self._first_row:self._last_row]
+
+    def get_timeline_lengths(self):
+        """returns the number of coverageByTime entries of every execution
+        """
+        return np.diff(self._compiled_results.column("timeline_offsets")[self._first_row:self._last_row + 1])
+
+    def get_opcode_hits(self):
+        """returns the opcodes and the executions x opcodes hits matrix
+        """
+        return self._compiled_results.opcodes, self._compiled_results.column("opcode_hits")[
+            self._first_row:self._last_row]
+
+    def get_detected_weaknesses(self):
+        """returns the weakness names and the (row, weakness code) pairs of the
+        detected weaknesses, one pair per detection. In the smartian standard
+        each class is detected at most once per execution
+        """
+        offsets, codes = self._compiled_results.read_codes("detected_weaknesses", self._first_row, self._last_row)
+        rows = np.repeat(np.arange(len(self)), np.diff(offsets))
+        codes = np.asarray(codes, dtype=np.int64)
+        names = self._compiled_results.weaknesses
+        if self._for_smartian:
+            smartian_names = [map_weakness_to_smartian_standard(x) for x in names]
+            names = sorted({x for x in smartian_names if x is not None})
+            smartian_codes = np.array(
+                [-1 if x is None else names.index(x) for x in smartian_names], dtype=np.int64)
+            codes = smartian_codes[codes] if len(codes) > 0 else codes
+            detected = codes >= 0
+            pairs = np.unique(rows[detected] * len(names) + codes[detected])
+            rows, codes = pairs // max(len(names), 1), pairs % max(len(names), 1)
+        return names, rows, codes
+
+    def get_time_to_weaknesses(self):
+        """returns the weakness names and the offsets, the codes and the times
+        of the timeToWeaknesses entries of the executions
+        """
+        offsets, codes = self._compiled_results.read_codes("time_to_weaknesses", self._first_row, self._last_row)
+        return self._compiled_results.weaknesses, offsets, codes, \
+            self._compiled_results.read_times(self._first_row, self._last_row)
+
+    def iter_timelines(self):
+        """yields the covered instructions, the heat map size, the epochs and
+        the coverage values of the coverageByTime of every execution
+        """
+        rows = slice(self._first_row, self._last_row)
+        timelines = self._compiled_results.read_timelines(self._first_row, self._last_row)
+        covered_instructions = self._compiled_results.column("covered_instructions")[rows].tolist()
+        heat_map_sizes = self._compiled_results.column("heat_map_size")[rows].tolist()
+        for row, (epochs, coverage) in enumerate(timelines):
+            yield covered_instructions[row], heat_map_sizes[row], epochs, coverage
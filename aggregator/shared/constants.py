@@ -3,3 +3,19 @@ GREYBOX_FUZZING = "greybox"
 DIRECTED_GREYBOX_FUZZING = "directed_greybox"
 OTHER_GREYBOX_FUZZING = "other_directed_greybox"
 
+FUZZING_TYPES = [BLACKBOX_FUZZING, DIRECTED_GREYBOX_FUZZING, GREYBOX_FUZZING, OTHER_GREYBOX_FUZZING]
+
+COMPILED_RESULTS_FOLDER = "compiled"
+SUMMARY_FILE = "summary.json"
+SUMMARY_VERSION = 2
+
+EXECUTION_FIELDS = [
+    "maxCoverage",
+    "averageCoverage",
+    "totalInstructions",
+    "criticalInstructionsHits",
+    "detectedWeaknesses",
+    "timeToWeaknesses",
+    "coverageByTime",
+    "instructionIndex",
+]
@@ -0,0 +1,64 @@
+"""
+this module contains the coverage curves of several runs aligned on a common time grid
+"""
+import numpy as np
+
+
+def resample(times, values, grid):
+    """returns the values at every time of the grid, each one being the last
+    value reported at or before it. The times before the first one take the
+    first value, so runs sampled at other times than the grid are never
+    pulled down to 0. The times must be sorted
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return np.zeros(len(grid))
+    indexes = np.searchsorted(times, grid, side='right') - 1
+    return values[np.maximum(indexes, 0)]
+
+
+class CoverageMatrix():
+    """coverage curves as a runs x time matrix, every row resampled on the
+    same time grid (in seconds since the start of the run), so the
+    statistics of the runs are computed at once on each column
+    """
+
+    def __init__(self, grid, values, labels: list = None) -> None:
+        self.grid = np.asarray(grid)
+        self.values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.grid))
+        self.labels = labels if labels is not None else [None] * len(self.values)
+
+    @staticmethod
+    def from_series(series: list, grid=None, labels: list = None) -> "CoverageMatrix":
+        """aligns (times, values) series, sampled at any times, on the grid,
+        each series holding its last value between its samples. By default the
+        grid holds every time reported by any of the series
+        """
+        series = [(np.asarray(times), values) for times, values in series]
+        if grid is None:
+            grid = np.unique(np.concatenate([np.empty(0)] + [times for times, _ in series]))
+        values = np.empty((len(series), len(grid)))
+        for row, (times, run_values) in enumerate(series):
+            values[row] = resample(times, run_values, grid)
+        return CoverageMatrix(grid, values, labels)
+
+    def mean(self):
+        """returns the mean curve of the runs
+        """
+        return self.values.mean(axis=0)
+
+    def median(self):
+        """returns the median curve of the runs
+        """
+        return np.median(self.values, axis=0)
+
+    def quantile(self, q):
+        """returns the curve of the q quantile of the runs, or one curve per quantile
+        """
+        return np.quantile(self.values, q, axis=0)
+
+    def band(self, low: float = 0.25, high: float = 0.75):
+        """returns the curves bounding the runs between the low and high quantiles
+        """
+        low_curve, high_curve = self.quantile([low, high])
+        return low_curve, high_curve
@@ -0,0 +1,92 @@
+"""
+this module contains the weakness detections of every execution, kept as
+offsets and codes arrays instead of a list of python objects
+"""
+from array import array
+
+import numpy as np
+
+
+class DetectionRecords():
+    """the detected weaknesses and the time to each weakness of every
+    execution, in order. The weaknesses of an execution are the slice of a
+    codes array between two offsets, like the compiled results store them
+    """
+
+    def __init__(self) -> None:
+        self.weaknesses = []
+        self._weakness_codes = {}
+        self._detected_offsets = array('q', [0])
+        self._detected_codes = array('l')
+        self._time_offsets = array('q', [0])
+        self._time_codes = array('l')
+        self._times = []
+
+    def __len__(self) -> int:
+        return len(self._detected_offsets) - 1
+
+    def __iter__(self):
+        """yields the (detected weaknesses, time to weaknesses) of every execution
+        """
+        weaknesses = self.weaknesses
+        for row in range(len(self)):
+            detected_codes = self._detected_codes[self._detected_offsets[row]:self._detected_offsets[row + 1]]
+            time_rows = range(self._time_offsets[row], self._time_offsets[row + 1])
+            yield [weaknesses[code] for code in detected_codes], \
+                {weaknesses[self._time_codes[x]]: self._times[x] for x in time_rows}
+
+    def add(self, detected_weaknesses: list, time_to_weaknesses: dict):
+        """adds the detections of an execution
+        """
+        self._detected_codes.extend(self._get_code(x) for x in detected_weaknesses)
+        self._detected_offsets.append(len(self._detected_codes))
+        self._time_codes.extend(self._get_code(x) for x in time_to_weaknesses)
+        self._times.extend(time_to_weaknesses.values())
+        self._time_offsets.append(len(self._time_codes))
+
+    def add_codes(self, weaknesses: list, detected_offsets, detected_codes, time_offsets, time_codes, times):
+        """adds the detections of several executions, given as offsets and
+        codes into the weaknesses, like the compiled results store them
+        """
+        translation = np.array([self._get_code(x) for x in weaknesses] or [0], dtype=np.int64)
+        self._detected_codes.extend(translation[np.asarray(detected_codes, dtype=np.int64)].tolist())
+        self._detected_offsets.extend(
+            (np.asarray(detected_offsets[1:], dtype=np.int64) + self._detected_offsets[-1]).tolist())
+        self._time_codes.extend(translation[np.asarray(time_codes, dtype=np.int64)].tolist())
+        self._times.extend(times.tolist() if isinstance(times, np.ndarray) else times)
+        self._time_offsets.extend((np.asarray(time_offsets[1:], dtype=np.int64) + self._time_offsets[-1]).tolist())
+
+    def extend(self, other: "DetectionRecords"):
+        """adds the detections of the executions of other records
+        """
+        self.add_codes(
+            other.weaknesses, other._detected_offsets, other._detected_codes,
+            other._time_offsets, other._time_codes, other._times)
+
+    def to_dict(self) -> dict:
+        """returns the records as a json serializable dict
+        """
+        return {
+            "weaknesses": self.weaknesses,
+            "detected_offsets": self._detected_offsets.tolist(),
+            "detected_codes": self._detected_codes.tolist(),
+            "time_offsets": self._time_offsets.tolist(),
+            "time_codes": self._time_codes.tolist(),
+            "times": self._times,
+        }
+
+    @staticmethod
+    def from_dict(value: dict) -> "DetectionRecords":
+        """returns the records of a dict written by to_dict
+        """
+        records = DetectionRecords()
+        records.add_codes(
+            value["weaknesses"], value["detected_offsets"], value["detected_codes"],
+            value["time_offsets"], value["time_codes"], value["times"])
+        return records
+
+    def _get_code(self, weakness: str) -> int:
+        if weakness not in self._weakness_codes:
+            self._weakness_codes[weakness] = len(self.weaknesses)
+            self.weaknesses.append(weakness)
+        return self._weakness_codes[weakness]
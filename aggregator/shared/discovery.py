@@ -0,0 +1,46 @@
+"""
+this module contains the bug discovery curves, the number of bugs found over time
+"""
+import numpy as np
+
+
+class BugDiscovery():
+    """first detection times of the bugs of one or more runs, sorted by
+    vulnerability class, so the number of bugs found before any time is a
+    binary search instead of a scan of every detection
+    """
+
+    def __init__(self, time_maps: list) -> None:
+        """the time maps hold the first detection time by (contract name,
+        vulnerability class) of each run
+        """
+        self._times_by_class = []
+        for time_map in time_maps:
+            times_by_class = {}
+            for (_, vulnerability_class), time in time_map.items():
+                times_by_class.setdefault(vulnerability_class, []).append(time)
+            self._times_by_class.append(
+                {vulnerability_class: np.sort(times) for vulnerability_class, times in times_by_class.items()})
+
+    def count_found_before(self, times, vulnerability_classes: list = None):
+        """returns the number of bugs found strictly before each time, averaged
+        across the runs. Only the bugs of the vulnerability classes are counted
+        (all of them by default)
+        """
+        times = np.asarray(times)
+        counts = np.zeros(times.shape, dtype=np.int64)
+        for times_by_class in self._times_by_class:
+            found_times = [
+                found_times for vulnerability_class, found_times in times_by_class.items()
+                if vulnerability_classes is None or vulnerability_class in vulnerability_classes]
+            if len(found_times) == 0:
+                continue
+            counts += np.searchsorted(np.sort(np.concatenate(found_times)), times, side='left')
+        return counts / max(len(self._times_by_class), 1)
+
+    def curve(self, step, horizon, vulnerability_classes: list = None):
+        """returns the times from 0 to the horizon, every step, and the number
+        of bugs found before each of them
+        """
+        times = np.arange(0, horizon + step, step)
+        return times, self.count_found_before(times, vulnerability_classes)
@@ -9,3 +9,11 @@ class ContractsNotFoundException(Exception):
 
     def __init__(self, *args: object) -> None:
         super().__init__(*args)
+
+
+class ResultsNotFoundException(Exception):
+    """the exception is raised when the results were not loaded
+    """
+
+    def __init__(self, *args: object) -> None:
+        super().__init__(*args)
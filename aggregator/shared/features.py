@@ -0,0 +1,94 @@
+"""
+this module contains the features of the contracts described by inputs.json
+"""
+import numpy as np
+
+CRITICAL_INSTRUCTION_PREFIX = "critical:"
+WEAKNESS_PREFIX = "weakness:"
+
+
+class ContractFeatures():
+    """features of the contracts of an inputs zip as a numpy structured array,
+    one row per contract of inputs.json: its file and name, numberOfBlocks,
+    numberOfBranches, the total and per opcode ("critical:<opcode>")
+    numberOfCriticalInstructions and a flag by labeled weakness
+    ("weakness:<weakness>")
+    """
+
+    def __init__(self, inputs: list) -> None:
+        self.opcodes = sorted({
+            opcode for contract in inputs for opcode in contract['numberOfCriticalInstructions']})
+        self.weaknesses = sorted({
+            weakness for contract in inputs for weakness in _split_weaknesses(contract['weaknesses'])})
+
+        dtype = [
+            ("file", object),
+            ("name", object),
+            ("numberOfBlocks", np.int64),
+            ("numberOfBranches", np.int64),
+            ("numberOfCriticalInstructions", np.int64),
+        ]
+        dtype += [(CRITICAL_INSTRUCTION_PREFIX + opcode, np.int64) for opcode in self.opcodes]
+        dtype += [(WEAKNESS_PREFIX + weakness, np.bool_) for weakness in self.weaknesses]
+
+        self.array = np.zeros(len(inputs), dtype=dtype)
+        self._row_by_name = {}
+        self._row_by_file = {}
+        for row, contract in enumerate(inputs):
+            critical_instructions = contract['numberOfCriticalInstructions']
+            record = self.array[row:row + 1]
+            # the older inputs.json files have no file, the contract name is used instead
+            record["file"] = contract.get('file', contract['name'])
+            record["name"] = contract['name']
+            record["numberOfBlocks"] = contract['numberOfBlocks']
+            record["numberOfBranches"] = contract['numberOfBranches']
+            record["numberOfCriticalInstructions"] = sum(critical_instructions.values())
+            for opcode, count in critical_instructions.items():
+                record[CRITICAL_INSTRUCTION_PREFIX + opcode] = count
+            for weakness in _split_weaknesses(contract['weaknesses']):
+                record[WEAKNESS_PREFIX + weakness] = True
+            self._row_by_name.setdefault(contract['name'], row)
+            self._row_by_file.setdefault(record["file"][0], row)
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    @property
+    def names(self) -> list:
+        """returns the contract names, in the order of the rows
+        """
+        return self.array["name"].tolist()
+
+    def get_row(self, name: str) -> int:
+        """returns the row of the first contract with the name, None when there is none
+        """
+        return self._row_by_name.get(name, None)
+
+    def get_row_by_file(self, file: str) -> int:
+        """returns the row of the first contract in the file, None when there is none
+        """
+        return self._row_by_file.get(file, None)
+
+    def get(self, name: str):
+        """returns the features of the first contract with the name
+        """
+        row = self.get_row(name)
+        return None if row is None else self.array[row]
+
+    def get_matrix(self, fields: list):
+        """returns the numeric fields as a contracts x fields matrix
+        """
+        return np.column_stack([self.array[field] for field in fields]).reshape(len(self.array), len(fields))
+
+    def get_weakness_mask(self, weakness: str):
+        """returns the mask of the contracts labeled with the weakness
+        """
+        if weakness not in self.weaknesses:
+            return np.zeros(len(self.array), dtype=bool)
+        return self.array[WEAKNESS_PREFIX + weakness]
+
+
+def _split_weaknesses(weaknesses: list) -> list:
+    """the weaknesses of a contract are listed as ';' separated strings
+    """
+    return [weakness for value in weaknesses for weakness in value.split(";") if weakness]
@@ -0,0 +1,60 @@
+"""
+this module contains the index of the instructions executed by a contract
+"""
+import numpy as np
+
+
+class InstructionIndex():
+    """heat map of an execution as numpy arrays, indexed by opcode
+    """
+
+    def __init__(self, instructions: dict, heat_map: dict) -> None:
+        self.opcodes = []
+        opcode_codes = {}
+        codes = np.empty(len(instructions), dtype=np.int64)
+        hits = np.empty(len(instructions), dtype=np.int64)
+        for position, (program_counter, instruction) in enumerate(instructions.items()):
+            if instruction not in opcode_codes:
+                opcode_codes[instruction] = len(self.opcodes)
+                self.opcodes.append(instruction)
+            codes[position] = opcode_codes[instruction]
+            hits[position] = heat_map.get(program_counter, 0)
+
+        order = np.argsort(codes, kind='stable')
+        boundaries = np.searchsorted(codes[order], np.arange(len(self.opcodes) + 1))
+        self.hits = hits
+        self.positions_by_opcode = {
+            opcode: order[boundaries[code]:boundaries[code + 1]] for code, opcode in enumerate(self.opcodes)}
+        self.hits_by_opcode = np.bincount(codes, weights=hits, minlength=len(self.opcodes)).astype(np.int64)
+
+        heat_map_hits = np.fromiter(heat_map.values(), dtype=np.int64, count=len(heat_map))
+        self.heat_map_size = len(heat_map)
+        self.covered_instructions = int(np.count_nonzero(heat_map_hits > 0))
+
+    @classmethod
+    def from_opcode_hits(cls, opcodes: list, hits_by_opcode, heat_map_size: int, covered_instructions: int):
+        """builds the index from the hits already summed by opcode, every opcode
+        stands for a single instruction holding all of its hits
+        """
+        instruction_index = cls.__new__(cls)
+        instruction_index.opcodes = opcodes
+        instruction_index.hits = np.asarray(hits_by_opcode, dtype=np.int64)
+        instruction_index.positions_by_opcode = {
+            opcode: np.array([code]) for code, opcode in enumerate(opcodes)}
+        instruction_index.hits_by_opcode = instruction_index.hits
+        instruction_index.heat_map_size = heat_map_size
+        instruction_index.covered_instructions = covered_instructions
+        return instruction_index
+
+    def get_positions(self, opcodes: list):
+        """returns the positions of the instructions with any of the opcodes
+        """
+        positions = [self.positions_by_opcode[opcode] for opcode in opcodes if opcode in self.positions_by_opcode]
+        if len(positions) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(positions)
+
+    def get_hits(self, opcodes: list) -> int:
+        """returns the hits of the instructions with any of the opcodes
+        """
+        return int(self.hits[self.get_positions(opcodes)].sum())
@@ -0,0 +1,127 @@
+"""
+this module contains accumulators that aggregate values one at a time
+"""
+import math
+
+import numpy as np
+
+
+class RunningStats():
+    """count, mean, variance, min and max of a series of values, updated one
+    value at a time with Welford's algorithm. Accumulators of disjoint series
+    are combined with merge. The mean is the sum of the values, added in
+    order, over their count, so it is rounded like a plain sum / len
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float):
+        """adds a value to the series
+        """
+        self.count += 1
+        self.total += value
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def add_all(self, values):
+        """adds an array of values to the series at once. The sum is still
+        taken in order, the variance of the values is merged like the one of
+        another accumulator
+        """
+        values = np.asarray(values)
+        if len(values) == 0:
+            return
+        # cumsum adds the values one after the other, unlike sum
+        total = np.cumsum(np.concatenate([[self.total], values]))[-1].item()
+        other = RunningStats()
+        other.count = len(values)
+        other._mean = float(values.mean())
+        other._m2 = float(((values - other._mean) ** 2).sum())
+        other.minimum = values.min().item()
+        other.maximum = values.max().item()
+        self.merge(other)
+        self.total = total
+
+    def merge(self, other: "RunningStats"):
+        """adds the values of another accumulator to the series
+        """
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.total, self._mean, self._m2 = other.count, other.total, other._mean, other._m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return
+        count = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def mean(self) -> float:
+        """mean of the series, 0 for no values
+        """
+        if self.count == 0:
+            return 0.0
+        return self.total / self.count
+
+    @property
+    def variance(self) -> float:
+        """sample variance of the series, 0 for less than two values
+        """
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        """sample standard deviation of the series
+        """
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> dict:
+        """returns the accumulator as a json serializable dict
+        """
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self._mean,
+            "m2": self._m2,
+            "min": self.minimum if self.count > 0 else None,
+            "max": self.maximum if self.count > 0 else None,
+        }
+
+    @staticmethod
+    def from_dict(value: dict) -> "RunningStats":
+        """returns the accumulator of a dict written by to_dict
+        """
+        stats = RunningStats()
+        if value["count"] > 0:
+            stats.count = value["count"]
+            stats.total = value["total"]
+            stats._mean = value["mean"]
+            stats.minimum = value["min"]
+            stats.maximum = value["max"]
+            stats._m2 = value["m2"]
+        return stats
+
+    @staticmethod
+    def merge_all(accumulators) -> "RunningStats":
+        """returns a new accumulator with the values of all the accumulators
+        """
+        merged = RunningStats()
+        for accumulator in accumulators:
+            merged.merge(accumulator)
+        return merged
@@ -0,0 +1,134 @@
+"""
+this module contains a streaming reader of the results files, which decodes
+a single execution at a time instead of the whole file
+"""
+import json
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARACTERS = '0123456789.eE+-'
+
+
+class ResultsStream():
+    """incremental reader of a results file shaped as {contract: {strategy: [execution]}},
+    only the execution being decoded is held in memory
+    """
+
+    def __init__(self, file, object_hook=None, chunk_size: int = 1024 * 1024) -> None:
+        self._file = file
+        self._decoder = json.JSONDecoder(object_hook=object_hook)
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self._position = 0
+        self._eof = False
+
+    def iter_executions(self):
+        """yields the (contract name, strategy, execution) records of the file
+        """
+        for contract_name, strategies in self.iter_contracts():
+            for strategy, executions in strategies:
+                for execution in executions:
+                    yield contract_name, strategy, execution
+
+    def iter_contracts(self):
+        """yields (contract name, strategies) pairs, the strategies yield
+        (strategy, executions) pairs and the executions yield the decoded
+        executions. Like itertools.groupby, whatever is left of a pair is
+        skipped when the next one is requested
+        """
+        self._expect('{')
+        if self._next_is('}'):
+            return
+        while True:
+            contract_name = self._read_value()
+            self._expect(':')
+            strategies = self._iter_strategies()
+            yield contract_name, strategies
+            for _ in strategies:
+                pass
+            if not self._read_separator('}'):
+                return
+
+    def _iter_strategies(self):
+        self._expect('{')
+        if self._next_is('}'):
+            return
+        while True:
+            strategy = self._read_value()
+            self._expect(':')
+            executions = self._iter_array()
+            yield strategy, executions
+            for _ in executions:
+                pass
+            if not self._read_separator('}'):
+                return
+
+    def _iter_array(self):
+        self._expect('[')
+        if self._next_is(']'):
+            return
+        while True:
+            yield self._read_value()
+            if not self._read_separator(']'):
+                return
+
+    def _read_value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+                # a value ending with the buffer, or a number cut inside its
+                # fraction or exponent, may continue in the next chunk
+                if self._eof or (end < len(self._buffer) and not (
+                        isinstance(value, (int, float)) and self._buffer[end] in _NUMBER_CHARACTERS)):
+                    self._position = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill(max(self._chunk_size, len(self._buffer) - self._position))
+
+    def _read_separator(self, closing: str) -> bool:
+        """consumes a comma, returning True, or the closing character, returning False
+        """
+        character = self._peek()
+        self._position += 1
+        if character == ',':
+            return True
+        if character == closing:
+            return False
+        raise ValueError(f"expected ',' or '{closing}' but found '{character}' in the results file")
+
+    def _expect(self, expected: str):
+        character = self._peek()
+        if character != expected:
+            raise ValueError(f"expected '{expected}' but found '{character}' in the results file")
+        self._position += 1
+
+    def _next_is(self, expected: str) -> bool:
+        if self._peek() != expected:
+            return False
+        self._position += 1
+        return True
+
+    def _peek(self) -> str:
+        """skips the whitespace and returns the next character without consuming it
+        """
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in _WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill(self._chunk_size):
+                raise ValueError("unexpected end of the results file")
+
+    def _fill(self, size: int) -> bool:
+        """drops the consumed text and reads the next chunk of the file
+        """
+        self._buffer = self._buffer[self._position:]
+        self._position = 0
+        content = self._file.read(size)
+        if not content:
+            self._eof = True
+            return False
+        self._buffer += content
+        return True
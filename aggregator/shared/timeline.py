@@ -0,0 +1,77 @@
+"""
+this module contains helpers to sample the time series reported by dogefuzz
+"""
+import re
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+MICROSECONDS_PER_SECOND = 1_000_000
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_UTC_OFFSET = re.compile(r'([+-])(\d{2}):(\d{2})$')
+
+
+def decode_timestamps(timestamps: list):
+    """decodes the ISO 8601 timestamps emitted by dogefuzz into an int64 array
+    of microseconds since the epoch. Timestamps sharing a single UTC offset are
+    parsed by numpy at once, anything else falls back to dateutil
+    """
+    if len(timestamps) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    first_timestamp = timestamps[0]
+    offset = 0
+    if first_timestamp.endswith('Z'):
+        suffix = 'Z'
+    else:
+        match = _UTC_OFFSET.search(first_timestamp)
+        if match is None:
+            suffix = ''
+        else:
+            suffix = match.group(0)
+            offset = (int(match.group(2)) * 60 + int(match.group(3))) * 60 * MICROSECONDS_PER_SECOND
+            if match.group(1) == '-':
+                offset = -offset
+
+    try:
+        if suffix:
+            if not all(timestamp.endswith(suffix) for timestamp in timestamps):
+                raise ValueError("the timestamps have different UTC offsets")
+            local_timestamps = [timestamp[:-len(suffix)] for timestamp in timestamps]
+        elif any(_UTC_OFFSET.search(timestamp) or timestamp.endswith('Z') for timestamp in timestamps):
+            raise ValueError("the timestamps have different UTC offsets")
+        else:
+            local_timestamps = timestamps
+        epochs = np.array(local_timestamps, dtype='datetime64[us]').astype(np.int64)
+    except ValueError:
+        # dateutil is only imported by the results it is needed for
+        from dateutil import parser
+        return to_epoch_microseconds([parser.isoparse(timestamp) for timestamp in timestamps])
+    return epochs - offset
+
+
+def to_epoch_microseconds(timestamps: list):
+    """converts datetimes into an int64 array of microseconds since the epoch
+    """
+    return np.array([
+        (timestamp - (_EPOCH if timestamp.tzinfo is None else _EPOCH_UTC)) // _MICROSECOND
+        for timestamp in timestamps
+    ], dtype=np.int64)
+
+
+def sample_indexes(epochs, time_frame_in_seconds: int, upper_limit_in_seconds: int):
+    """returns, for every time frame after the first timestamp, the index of the
+    first entry reported after it. Time frames past the last entry keep the
+    index of the previous time frame. The epochs need not be sorted: the first
+    entry after a time is the first one where their running maximum passes it
+    """
+    epochs = np.asarray(epochs)
+    offsets = np.arange(
+        time_frame_in_seconds, upper_limit_in_seconds + time_frame_in_seconds, time_frame_in_seconds)
+    query_times = epochs.min() + offsets * MICROSECONDS_PER_SECOND
+    indexes = np.searchsorted(np.maximum.accumulate(epochs), query_times, side='right')
+    indexes = np.where(indexes < len(epochs), indexes, 0)
+    return offsets, np.maximum.accumulate(indexes)
@@ -48,6 +48,13 @@ def map_weakness_to_smartian_standard(vulnerability: str) -> str:
     else:
         return None
 
+
+def map_weaknesses_to_smartian_standard(weaknesses: list) -> list:
+    return list(set(
+        x for x in [map_weakness_to_smartian_standard(x) for x in weaknesses]
+        if x is not None
+    ))
+
 def map_vulnerability_smartian_to_long_name(vulnerability: str) -> str:
     if vulnerability == 'ME':
         return 'MishandledException'
@@ -0,0 +1,86 @@
+"""
+this module contains the private working folder of an aggregation
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import shutil
+import sys
+import tempfile
+
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 2
+
+
+class Workspace():
+    """unique temporary folder of an aggregation, created under the root folder
+    and removed when the aggregation ends. The files are written there and then
+    published into their final folder, so concurrent aggregations never read
+    or clobber each other's partially written files
+    """
+
+    def __init__(self, root: str) -> None:
+        self._root = root
+        self.path = None
+
+    def __enter__(self) -> "Workspace":
+        os.makedirs(self._root, exist_ok=True)
+        self.path = tempfile.mkdtemp(prefix=f"{os.getpid()}-", dir=self._root)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.path = None
+
+    def publish(self, folder: str, names: list = None):
+        """moves the files and folders of the workspace (all of them by
+        default) into the folder, each one replacing the former one at once.
+        A folder replaces a former one at once only where the two can be
+        exchanged (renameat2 on Linux), elsewhere the former folder is moved
+        away first and readers may briefly find neither of them
+        """
+        if names is None:
+            names = sorted(os.listdir(self.path))
+        os.makedirs(folder, exist_ok=True)
+        for name in names:
+            self._replace(os.path.join(self.path, name), os.path.join(folder, name))
+
+    def _replace(self, source: str, target: str):
+        if os.path.isdir(source) and os.path.isdir(target):
+            # a folder can't replace a non empty one, so the two are exchanged
+            # and the former one is left in the workspace to be removed with it
+            if _exchange(source, target):
+                return
+            former_target = tempfile.mkdtemp(prefix="former-", dir=self.path)
+            os.replace(target, os.path.join(former_target, os.path.basename(target)))
+        try:
+            os.replace(source, target)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # the workspace root is on another file system, the copy is renamed into place
+            copy = f"{target}.tmp-{os.getpid()}"
+            if os.path.isdir(source):
+                shutil.copytree(source, copy)
+            else:
+                shutil.copyfile(source, copy)
+            os.replace(copy, target)
+
+
+def _exchange(source: str, target: str) -> bool:
+    """swaps two paths at once, returns False when the platform or the file
+    system can't
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    renameat2 = getattr(libc, "renameat2", None)
+    if renameat2 is None:
+        return False
+    if renameat2(_AT_FDCWD, os.fsencode(source), _AT_FDCWD, os.fsencode(target), _RENAME_EXCHANGE) == 0:
+        return True
+    error = ctypes.get_errno()
+    if error in (errno.EINVAL, errno.ENOSYS, errno.EXDEV):
+        return False
+    raise OSError(error, os.strerror(error), target)
@@ -0,0 +1,62 @@
+"""
+measures the startup of the aggregator command line with python -X importtime,
+failing when the plain `aggregator --help` path imports a heavy dependency or
+exceeds its time budget
+
+usage: python benchmarks/import_time.py --max_ms 1000 --repeat 3
+"""
+import os
+import subprocess
+import sys
+
+import fire
+
+ROOT_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# dependencies only the plotting and clustering commands may import
+HEAVY_MODULES = ["matplotlib", "mplcursors", "sklearn", "scipy", "dateutil"]
+
+_HELP_COMMAND = "import sys; sys.argv = ['aggregator', '--help']; from aggregator import main; main()"
+
+
+def _import_help() -> map:
+    """runs `aggregator --help` and returns the cumulative import time, in
+    microseconds, of the modules it imported, and of the top level imports
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _HELP_COMMAND],
+        cwd=ROOT_FOLDER, capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"aggregator --help failed:\n{process.stderr}")
+
+    cumulative_by_module = {}
+    total = 0
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        # the nested imports are indented below the module importing them
+        if not module.startswith("  "):
+            total += int(cumulative)
+        cumulative_by_module[module.strip()] = int(cumulative)
+    return cumulative_by_module, total
+
+
+def main(max_ms: float = 1000, repeat: int = 3):
+    runs = [_import_help() for _ in range(repeat)]
+    aggregator_ms = min(run.get("aggregator", 0) for run, _ in runs) / 1000
+    total_ms = min(total for _, total in runs) / 1000
+    heavy_modules = sorted(module for module in runs[0][0] if module in HEAVY_MODULES)
+
+    print(f"{'import aggregator':20}: {aggregator_ms:.1f}ms")
+    print(f"{'all imports':20}: {total_ms:.1f}ms")
+    print(f"{'heavy modules':20}: {', '.join(heavy_modules) if heavy_modules else 'none'}")
+
+    if heavy_modules:
+        sys.exit(f"aggregator --help imports {', '.join(heavy_modules)}, they must be imported by the commands using them")
+    if aggregator_ms > max_ms:
+        sys.exit(f"importing aggregator took {aggregator_ms:.1f}ms, over the budget of {max_ms:.0f}ms")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,41 @@
+"""
+compares the serial and the parallel parsing of an experiment results zip
+
+usage: python benchmarks/parse_results.py <experiment_folder> --workers 4 --repeat 3
+"""
+import os
+import sys
+import time
+
+import fire
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregator.config import Config
+from aggregator.context import ExperimentContext
+from aggregator.shared.constants import FUZZING_TYPES
+
+
+def _parse(results_folder: str, workers: int) -> float:
+    config = Config()
+    config.workers = workers
+    result_service = ExperimentContext(config).result_service
+
+    start = time.perf_counter()
+    result_service.load_results(results_folder)
+    for strategy in FUZZING_TYPES:
+        result_service.get_executions(strategy)
+    return time.perf_counter() - start
+
+
+def main(results_folder: str, workers: int = os.cpu_count(), repeat: int = 3):
+    serial = min(_parse(results_folder, 1) for _ in range(repeat))
+    parallel = min(_parse(results_folder, workers) for _ in range(repeat))
+
+    print(f"{'serial':20}: {serial:.3f}s")
+    print(f"{f'{workers} workers':20}: {parallel:.3f}s")
+    print(f"{'speedup':20}: {serial / parallel:.2f}x")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
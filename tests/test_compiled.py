@@ -0,0 +1,152 @@
+import json
+import os
+import zipfile
+
+import pytest
+
+from aggregator.config import Config
+from aggregator.context import ExperimentContext
+from aggregator.services.metrics import MetricsTable
+from aggregator.shared import compiled
+from aggregator.shared.constants import FUZZING_TYPES
+from aggregator.shared.detections import DetectionRecords
+
+
+def _execution(detected_weaknesses: list, time_to_weaknesses: dict, max_coverage: int, timestamps: list) -> dict:
+    return {
+        "status": "success",
+        "execution": {
+            "maxCoverage": max_coverage,
+            "averageCoverage": max_coverage / 3,
+            "totalInstructions": 40,
+            "criticalInstructionsHits": max_coverage % 7,
+            "detectedWeaknesses": detected_weaknesses,
+            "timeToWeaknesses": time_to_weaknesses,
+            "coverageByTime": {"x": timestamps, "y": list(range(1, len(timestamps) + 1))},
+            "instructions": {"0": "CALL", "2": "ADD", "4": "CALL", "6": "SSTORE"},
+            "instructionHitsHeatMap": {"0": max_coverage, "2": 0, "4": 3, "6": 1},
+        },
+    }
+
+
+RESULTS = {
+    "a.sol": {
+        "blackbox": [
+            _execution(["reentrancy", "delegate", "reentrancy"], {"reentrancy": 30, "delegate": 12}, 21,
+                       ["2023-05-30T12:00:44-03:00", "2023-05-30T12:02:46.5-03:00"]),
+            {"status": "error", "execution": {}},
+            _execution([], {}, 3, ["2023-05-30T12:00:00Z"]),
+            _execution(["delegate"], {"delegate": 7}, 17, ["2023-05-30T12:30:00Z"]),
+        ],
+        "greybox": [
+            _execution(["gasless-send", "exception-disorder"], {"gasless-send": 2.5, "exception-disorder": 4}, 30,
+                       ["2023-05-30T12:00:44-03:00", "2023-05-30T12:10:00-03:00", "2023-05-30T12:20:00-03:00"]),
+        ],
+    },
+    "b.sol": {
+        "blackbox": [_execution(["timestamp-dependency"], {"timestamp-dependency": 99}, 8, ["2023-05-30T12:00:44Z"])],
+    },
+}
+
+
+@pytest.fixture
+def context(tmp_path) -> ExperimentContext:
+    experiment_folder = tmp_path / "results" / "exp"
+    experiment_folder.mkdir(parents=True)
+    with zipfile.ZipFile(experiment_folder / "exp.zip", "w") as results_zip:
+        results_zip.writestr("results_0.json", json.dumps(RESULTS))
+
+    config = Config()
+    config.results_folder = str(tmp_path / "results")
+    config.temp_folder = str(tmp_path / ".temp")
+    return ExperimentContext(config)
+
+
+def _metrics_summary(context: ExperimentContext) -> dict:
+    table = MetricsTable()
+    for strategy, contract_name, executions in context.result_service.iter_executions(FUZZING_TYPES):
+        table.add_contract_executions(strategy, contract_name, executions)
+    summary = table.to_summary()
+    for metrics_by_contract_name in summary.values():
+        for metrics in metrics_by_contract_name.values():
+            # the smartian classes detected by an execution come from a set, so they are compared sorted
+            metrics["weaknesses"] = [
+                (sorted(detected_weaknesses), time_to_weaknesses)
+                for detected_weaknesses, time_to_weaknesses in DetectionRecords.from_dict(metrics["weaknesses"])]
+            # the compiled results keep the hits by opcode, not which opcodes an execution had
+            metrics["hits_by_instruction"] = {x: y for x, y in metrics["hits_by_instruction"].items() if y > 0}
+            # the variance of the compiled executions is computed at once rather than one value at a time
+            for stats in ["max_coverage", "average_coverage", "critical_instructions_hits", "transaction_count"]:
+                metrics[stats]["m2"] = pytest.approx(metrics[stats]["m2"])
+                metrics[stats]["mean"] = pytest.approx(metrics[stats]["mean"])
+    return summary
+
+
+@pytest.mark.parametrize("for_smartian", [False, True])
+def test_compiled_results_aggregate_like_the_results_zip(context, for_smartian):
+    context.result_service.load_results("exp")
+    if for_smartian:
+        context.result_service.convert_results_to_smartian("exp")
+    expected = _metrics_summary(context)
+
+    context.result_service.compile_results("exp")
+    context.result_service.load_results("exp")
+    if for_smartian:
+        context.result_service.convert_results_to_smartian("exp")
+
+    assert context.result_service._compiled_results is not None
+    assert _metrics_summary(context) == expected
+
+
+def test_compiled_executions_keep_the_weaknesses_in_order_with_duplicates(context):
+    context.result_service.load_results("exp")
+    expected = {strategy: context.result_service.get_executions(strategy) for strategy in ["blackbox", "greybox"]}
+
+    context.result_service.compile_results("exp")
+    context.result_service.load_results("exp")
+
+    for strategy, executions_by_contract_name in expected.items():
+        executions = context.result_service.get_executions(strategy)
+        assert list(executions) == list(executions_by_contract_name)
+        for contract_name, contract_executions in executions_by_contract_name.items():
+            for execution, expected_execution in zip(executions[contract_name], contract_executions, strict=True):
+                for field in ["detectedWeaknesses", "timeToWeaknesses", "maxCoverage", "criticalInstructionsHits"]:
+                    assert execution["execution"][field] == expected_execution["execution"][field]
+                assert execution["execution"]["coverageByTime"]["epochs"].tolist() == \
+                    expected_execution["execution"]["coverageByTime"]["epochs"].tolist()
+
+
+def test_coverage_over_time_of_compiled_results(context):
+    contracts = [type("Contract", (), {"file": name})() for name in RESULTS]
+    context.result_service.load_results("exp")
+    expected = context.result_service.get_instructions_coverage("blackbox", contracts, 60, 600)
+    expected_matrix = context.result_service.get_coverage_matrix("blackbox", 60, 600)
+
+    context.result_service.compile_results("exp")
+    context.result_service.load_results("exp")
+
+    assert context.result_service.get_instructions_coverage("blackbox", contracts, 60, 600) == expected
+    coverage_matrix = context.result_service.get_coverage_matrix("blackbox", 60, 600)
+    assert coverage_matrix.labels == expected_matrix.labels
+    assert coverage_matrix.values.tolist() == expected_matrix.values.tolist()
+
+
+def test_too_many_weakness_types_raise(context, monkeypatch):
+    monkeypatch.setattr(compiled, "MAX_WEAKNESS_CODES", 4)
+    context.result_service.load_results("exp")
+
+    with pytest.raises(ValueError):
+        context.result_service.compile_results("exp")
+    assert not os.path.exists(os.path.join(context.config.results_folder, "exp", "compiled"))
+
+
+def test_outdated_compiled_results_fall_back_to_the_results_zip(context, capsys):
+    context.result_service.compile_results("exp")
+    with zipfile.ZipFile(os.path.join(context.config.results_folder, "exp", "exp.zip"), "w") as results_zip:
+        results_zip.writestr("results_0.json", json.dumps({"b.sol": RESULTS["b.sol"]}))
+
+    context.result_service.load_results("exp")
+
+    assert context.result_service._compiled_results is None
+    assert list(context.result_service.get_executions("blackbox")) == ["b.sol"]
+    assert capsys.readouterr().out == ""
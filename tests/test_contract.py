@@ -0,0 +1,57 @@
+import pytest
+
+from aggregator.services.contract import Contract, ContractRegistry
+
+CONTRACTS = [
+    Contract("a.sol", "A", ["reentrancy", "delegate", "reentrancy"]),
+    Contract("b.sol", "B", ["delegate"]),
+    Contract("a.sol", "A2", []),
+    Contract("c.sol", "A", ["gasless-send"]),
+]
+
+
+def test_the_indexes_find_the_first_contract():
+    registry = ContractRegistry(CONTRACTS)
+
+    assert len(registry) == 4
+    assert list(registry) == CONTRACTS
+    assert registry.get_by_file("a.sol") is CONTRACTS[0]
+    assert registry.get_by_name("A") is CONTRACTS[0]
+    assert registry.get_by_name("A2") is CONTRACTS[2]
+    assert registry.get_row("B") == 1
+    assert registry.get_row_by_file("c.sol") == 3
+    assert registry.get_by_file("missing.sol") is None
+    assert registry.get_row("missing") is None
+
+
+def test_vulnerabilities_are_indexed_by_row_and_counted_by_label():
+    registry = ContractRegistry(CONTRACTS)
+
+    assert registry.vulnerabilities == ["reentrancy", "delegate", "gasless-send"]
+    assert registry.get_rows_with_vulnerability("reentrancy") == [0]
+    assert registry.get_rows_with_vulnerability("delegate") == [0, 1]
+    assert registry.get_vulnerability_count("reentrancy") == 2
+    assert registry.get_vulnerability_count("missing") == 0
+    assert registry.get_rows_with_vulnerability("missing") == []
+
+
+@pytest.mark.parametrize("rows", [[], [3, 1], [0, 2, 2], range(4)])
+def test_select_keeps_the_rows_in_their_order_and_reindexes_them(rows):
+    registry = ContractRegistry(CONTRACTS).select(rows)
+
+    expected = [CONTRACTS[row] for row in rows]
+    assert list(registry) == expected
+    for contract in expected:
+        assert registry.get_by_file(contract.file) is next(x for x in expected if x.file == contract.file)
+        assert registry.get_by_name(contract.name) is next(x for x in expected if x.name == contract.name)
+    for vulnerability in registry.vulnerabilities:
+        assert [registry[row] for row in registry.get_rows_with_vulnerability(vulnerability)] == \
+            [x for x in expected if vulnerability in x.vulnerabilities]
+
+
+def test_with_vulnerability_selects_the_labeled_contracts():
+    registry = ContractRegistry(CONTRACTS).with_vulnerability("delegate")
+
+    assert list(registry) == CONTRACTS[:2]
+    assert registry.get_vulnerability_count("reentrancy") == 2
+    assert len(ContractRegistry(CONTRACTS).with_vulnerability("missing")) == 0
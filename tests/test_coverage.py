@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from aggregator.shared.coverage import CoverageMatrix, resample
+
+
+def test_resample_holds_the_last_value():
+    assert resample([0, 10, 20], [1, 5, 7], [0, 5, 10, 15, 20, 25]).tolist() == [1, 1, 5, 5, 7, 7]
+
+
+def test_resample_takes_the_first_value_before_the_first_sample():
+    assert resample([10, 20], [3, 4], [0, 10, 30]).tolist() == [3, 3, 4]
+    assert resample([], [], [0, 10]).tolist() == [0, 0]
+
+
+def test_runs_sampled_at_other_times_are_carried_forward_on_the_union_grid():
+    coverage_matrix = CoverageMatrix.from_series([([0, 10, 20], [10, 20, 30]), ([5, 15, 25], [10, 20, 30])])
+
+    assert coverage_matrix.grid.tolist() == [0, 5, 10, 15, 20, 25]
+    assert coverage_matrix.values.tolist() == [[10, 10, 20, 20, 30, 30], [10, 10, 10, 20, 20, 30]]
+    assert coverage_matrix.mean().tolist() == [10, 10, 15, 20, 25, 30]
+
+
+def test_runs_sharing_their_sample_points_average_like_their_lines():
+    runs = [[0, 4, 9], [2, 4, 5], [1, 1, 7]]
+
+    coverage_matrix = CoverageMatrix.from_series([([0, 1, 2], run) for run in runs])
+
+    assert coverage_matrix.mean().tolist() == [sum(row) / len(row) for row in zip(*runs)]
+    low, high = coverage_matrix.band()
+    assert low.tolist() == pytest.approx(np.quantile(runs, 0.25, axis=0).tolist())
+    assert high.tolist() == pytest.approx(np.quantile(runs, 0.75, axis=0).tolist())
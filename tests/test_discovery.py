@@ -0,0 +1,38 @@
+import numpy as np
+
+from aggregator.shared.discovery import BugDiscovery
+
+FIRST_RUN = {("a.sol", "RE"): 30, ("a.sol", "ME"): 5, ("b.sol", "ME"): 60, ("c.sol", "BD"): 30}
+SECOND_RUN = {("a.sol", "RE"): 10, ("b.sol", "BD"): 90}
+
+
+def _scan_count(time_maps: list, time, vulnerability_classes: list = None) -> float:
+    """the scan of every detection count_found_before replaces"""
+    found = [
+        sum(1 for (_, vulnerability_class), found_time in time_map.items()
+            if found_time < time and (vulnerability_classes is None or vulnerability_class in vulnerability_classes))
+        for time_map in time_maps]
+    return sum(found) / len(found)
+
+
+def test_count_found_before_matches_a_scan_of_the_detections():
+    discovery = BugDiscovery([FIRST_RUN, SECOND_RUN])
+    times = [0, 5, 6, 10, 30, 31, 60, 90, 91, 1000]
+
+    for vulnerability_classes in [None, ["RE"], ["ME", "BD"], ["XX"]]:
+        assert discovery.count_found_before(times, vulnerability_classes).tolist() == \
+            [_scan_count([FIRST_RUN, SECOND_RUN], time, vulnerability_classes) for time in times]
+
+
+def test_curve_counts_the_bugs_found_before_every_step():
+    times, found = BugDiscovery([FIRST_RUN]).curve(30, 90)
+
+    assert times.tolist() == [0, 30, 60, 90]
+    assert found.tolist() == [0, 1, 3, 4]
+
+
+def test_curve_of_no_runs_is_flat():
+    times, found = BugDiscovery([]).curve(10, 30, ["RE"])
+
+    assert times.tolist() == [0, 10, 20, 30]
+    assert np.all(found == 0)
@@ -0,0 +1,114 @@
+import json
+
+import pytest
+
+from aggregator.services.contract import Contract, ContractRegistry
+from aggregator.services.metrics import ContractMetrics, MetricsTable
+
+
+def _execution(detected_weaknesses: list, time_to_weaknesses: dict, max_coverage: int = 50) -> dict:
+    return {
+        "status": "success",
+        "execution": {
+            "totalInstructions": 100,
+            "maxCoverage": max_coverage,
+            "detectedWeaknesses": detected_weaknesses,
+            "timeToWeaknesses": time_to_weaknesses,
+        },
+    }
+
+
+def _contract_metrics(executions: list) -> ContractMetrics:
+    metrics = ContractMetrics()
+    for execution in executions:
+        metrics.add_execution(execution)
+    return metrics
+
+
+def test_the_detections_of_every_execution_are_kept_in_order():
+    metrics = _contract_metrics([
+        _execution(["reentrancy", "delegate", "reentrancy"], {"reentrancy": 30, "delegate": 12}),
+        _execution(["delegate"], {"delegate": 7}),
+        _execution([], {}),
+    ])
+
+    assert metrics.execution_count == 3
+    assert metrics.detections == {"reentrancy": 2, "delegate": 2}
+    assert metrics.detected_executions == {"reentrancy": 1, "delegate": 2}
+    assert list(metrics.weaknesses) == [
+        (["reentrancy", "delegate", "reentrancy"], {"reentrancy": 30, "delegate": 12}),
+        (["delegate"], {"delegate": 7}),
+        ([], {}),
+    ]
+    assert metrics.max_coverage.mean == 0.5
+
+
+def test_merge_equals_adding_every_execution():
+    executions = [
+        _execution(["delegate", "delegate"], {"delegate": 9}, 10),
+        _execution(["gasless-send"], {"gasless-send": 4.5}, 20),
+        _execution(["delegate"], {"delegate": 3}, 70),
+    ]
+
+    merged = _contract_metrics(executions[:1])
+    merged.merge(_contract_metrics(executions[1:]))
+
+    expected = _contract_metrics(executions)
+    assert merged.execution_count == expected.execution_count
+    assert merged.detections == expected.detections
+    assert merged.detected_executions == expected.detected_executions
+    assert list(merged.weaknesses) == list(expected.weaknesses)
+    assert merged.max_coverage.mean == pytest.approx(expected.max_coverage.mean)
+
+
+def test_summary_round_trip_in_the_smartian_standard():
+    metrics = _contract_metrics([
+        _execution(["delegate", "gasless-send"], {"delegate": 5, "gasless-send": 2}),
+        _execution(["reentrancy"], {"reentrancy": 8}),
+    ])
+    summary = json.loads(json.dumps(metrics.to_summary()))
+
+    assert list(ContractMetrics.from_summary(summary, for_smartian=False).weaknesses) == list(metrics.weaknesses)
+    smartian_metrics = ContractMetrics.from_summary(summary, for_smartian=True)
+    assert smartian_metrics.detections == {"ME": 1, "RE": 1}
+    assert smartian_metrics.detected_executions == {"ME": 1, "RE": 1}
+    assert list(smartian_metrics.weaknesses) == [
+        (["ME"], {"delegate": 5, "gasless-send": 2}), (["RE"], {"reentrancy": 8})]
+
+
+def test_detection_lines_and_rows_are_written_for_every_execution():
+    contracts = ContractRegistry([Contract("a.sol", "A", ["RE", "ME"]), Contract("b.sol", "B", ["ME"])])
+    table = MetricsTable()
+    table.add_contract_executions("blackbox", "a.sol", [
+        _execution(["RE"], {"reentrancy": 30}),
+        _execution(["RE", "ME"], {"reentrancy": 12, "gasless-send": 40, "delegate": 41}),
+        _execution([], {}),
+    ])
+    table.add_contract_executions("blackbox", "b.sol", [_execution(["ME"], {"delegate": 50})])
+
+    detection, time_maps = table.get_detection("blackbox", contracts, ["RE", "ME", "BD"])
+
+    assert detection == {
+        "RE": [
+            "Fully found Reentrancy from a.sol [30] sec",
+            "Fully found Reentrancy from a.sol [12] sec",
+            "Never found Reentrancy from a.sol",
+        ],
+        "ME": [
+            "Never found MishandledException from a.sol",
+            "Fully found MishandledException from a.sol [40] sec",
+            "Never found MishandledException from a.sol",
+            "Fully found MishandledException from b.sol [50] sec",
+        ],
+        "BD": [],
+    }
+    # the time of a contract and vulnerability is the one of the last execution which found it
+    assert time_maps == [{("a.sol", "Reentrancy"): 12, ("a.sol", "MishandledException"): 40,
+                          ("b.sol", "MishandledException"): 50}]
+    assert table.get_detection_csv("blackbox", contracts) == [
+        ("a.sol", "reentrancy", "30"),
+        ("a.sol", "reentrancy", "12"),
+        ("a.sol", "gasless-send", "40"),
+        ("a.sol", "delegate", "41"),
+        ("b.sol", "delegate", "50"),
+    ]
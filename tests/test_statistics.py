@@ -0,0 +1,65 @@
+import math
+import statistics
+
+import numpy as np
+import pytest
+
+from aggregator.shared.statistics import RunningStats
+
+
+def _running_stats(values: list) -> RunningStats:
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    return stats
+
+
+def test_add_matches_the_statistics_module():
+    values = [0.31, 0.25, 0.9, 0.875, 0.0, 0.31]
+
+    stats = _running_stats(values)
+
+    assert stats.count == len(values)
+    assert stats.mean == sum(values) / len(values)
+    assert stats.variance == pytest.approx(statistics.variance(values))
+    assert stats.std == pytest.approx(statistics.stdev(values))
+    assert (stats.minimum, stats.maximum) == (0.0, 0.9)
+
+
+def test_mean_is_rounded_like_sum_over_len():
+    values = [0.1] * 10 + [1 / 3] * 7
+
+    assert _running_stats(values).mean == sum(values) / len(values)
+
+
+@pytest.mark.parametrize("split", [0, 1, 5, 17, 30])
+def test_merge_equals_adding_every_value(split):
+    values = np.random.default_rng(3).normal(50, 20, size=30).tolist()
+
+    merged = _running_stats(values[:split])
+    merged.merge(_running_stats(values[split:]))
+
+    expected = _running_stats(values)
+    assert merged.count == expected.count
+    assert merged.mean == pytest.approx(expected.mean)
+    assert merged.variance == pytest.approx(expected.variance)
+    assert (merged.minimum, merged.maximum) == (expected.minimum, expected.maximum)
+
+
+def test_merge_all_of_nothing_is_empty():
+    stats = RunningStats.merge_all([RunningStats(), RunningStats()])
+
+    assert stats.count == 0
+    assert stats.mean == 0.0
+    assert stats.variance == 0.0
+    assert (stats.minimum, stats.maximum) == (math.inf, -math.inf)
+
+
+def test_dict_round_trip():
+    stats = _running_stats([3, 1, 4, 1, 5])
+
+    restored = RunningStats.from_dict(stats.to_dict())
+
+    assert restored.to_dict() == stats.to_dict()
+    assert restored.std == stats.std
+    assert RunningStats.from_dict(RunningStats().to_dict()).count == 0
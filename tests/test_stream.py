@@ -0,0 +1,64 @@
+import io
+import json
+
+import pytest
+
+from aggregator.shared.stream import ResultsStream
+
+RESULTS = {
+    "a.sol": {
+        "blackbox": [{"status": "success", "maxCoverage": 12.5}, {"status": "error", "maxCoverage": 1e-3}],
+        "greybox": [],
+    },
+    "b.sol": {},
+    "c.sol": {"greybox": [{"status": "success", "maxCoverage": -7, "names": ["x", "y"]}]},
+}
+
+
+def _stream(value, chunk_size: int = 1024 * 1024, object_hook=None) -> ResultsStream:
+    return ResultsStream(io.StringIO(json.dumps(value)), object_hook, chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1024])
+def test_iter_executions_reads_every_execution_whatever_the_chunk_size(chunk_size):
+    executions = list(_stream(RESULTS, chunk_size).iter_executions())
+
+    assert executions == [
+        ("a.sol", "blackbox", RESULTS["a.sol"]["blackbox"][0]),
+        ("a.sol", "blackbox", RESULTS["a.sol"]["blackbox"][1]),
+        ("c.sol", "greybox", RESULTS["c.sol"]["greybox"][0]),
+    ]
+
+
+def test_numbers_cut_by_a_chunk_are_read_whole():
+    value = {"a.sol": {"blackbox": [{"x": 123456789.125e-2}, {"x": 98765}]}}
+
+    executions = [execution for _, _, execution in _stream(value, chunk_size=4).iter_executions()]
+
+    assert executions == [{"x": 123456789.125e-2}, {"x": 98765}]
+
+
+def test_empty_results():
+    assert list(_stream({}).iter_executions()) == []
+
+
+def test_the_rest_of_a_contract_is_skipped_when_the_next_one_is_requested():
+    contract_names = []
+    for contract_name, strategies in _stream(RESULTS, chunk_size=5).iter_contracts():
+        contract_names.append(contract_name)
+        for strategy, executions in strategies:
+            next(executions, None)
+            break
+
+    assert contract_names == ["a.sol", "b.sol", "c.sol"]
+
+
+def test_object_hook_is_applied_to_the_decoded_executions():
+    executions = list(_stream(RESULTS, object_hook=lambda value: value.get("status", value)).iter_executions())
+
+    assert [execution for _, _, execution in executions] == ["success", "error", "success"]
+
+
+def test_truncated_results_raise():
+    with pytest.raises(ValueError):
+        list(ResultsStream(io.StringIO(json.dumps(RESULTS)[:-3]), chunk_size=8).iter_executions())
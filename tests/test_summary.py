@@ -0,0 +1,119 @@
+import json
+import zipfile
+
+import pytest
+
+from aggregator.config import Config
+from aggregator.context import ExperimentContext
+
+
+def _execution(detected_weaknesses: list, time_to_weaknesses: dict, max_coverage: int) -> dict:
+    return {
+        "status": "success",
+        "execution": {
+            "maxCoverage": max_coverage,
+            "averageCoverage": max_coverage / 2,
+            "totalInstructions": 40,
+            "criticalInstructionsHits": max_coverage % 5,
+            "detectedWeaknesses": detected_weaknesses,
+            "timeToWeaknesses": time_to_weaknesses,
+            "coverageByTime": {"x": ["2023-05-30T12:00:00Z", "2023-05-30T12:06:00Z"], "y": [1, max_coverage]},
+            "instructions": {"0": "CALL", "2": "SSTORE"},
+            "instructionHitsHeatMap": {"0": max_coverage, "2": 1},
+        },
+    }
+
+
+FIRST_RESULTS = {
+    "a.sol": {
+        "blackbox": [_execution(["reentrancy"], {"reentrancy": 30}, 21), _execution([], {}, 4)],
+        "greybox": [],
+    },
+    "b.sol": {
+        "blackbox": [],
+        "greybox": [_execution(["delegate", "gasless-send"], {"delegate": 5, "gasless-send": 9}, 11)],
+    },
+}
+SECOND_RESULTS = {
+    "a.sol": {
+        "blackbox": [_execution(["reentrancy", "delegate"], {"reentrancy": 12, "delegate": 40}, 33)],
+        "greybox": [],
+    },
+}
+
+
+@pytest.fixture
+def context(tmp_path) -> ExperimentContext:
+    for results_folder_name, results in [("first", FIRST_RESULTS), ("second", SECOND_RESULTS)]:
+        experiment_folder = tmp_path / "results" / results_folder_name
+        experiment_folder.mkdir(parents=True)
+        with zipfile.ZipFile(experiment_folder / f"{results_folder_name}.zip", "w") as results_zip:
+            results_zip.writestr("results_0.json", json.dumps(results))
+
+    config = Config()
+    config.results_folder = str(tmp_path / "results")
+    config.temp_folder = str(tmp_path / ".temp")
+    return ExperimentContext(config)
+
+
+def _summarize(context: ExperimentContext, results_folder_name: str) -> str:
+    context.result_service.load_results(results_folder_name)
+    return context.metrics_service.write_summary(results_folder_name)
+
+
+def test_a_summary_merges_back_into_the_same_metrics(context):
+    summary_file = _summarize(context, "first")
+    expected = context.metrics_service.build_table(["blackbox", "greybox"]).to_summary()
+
+    table, instruction_coverage, _ = context.metrics_service.merge_summaries([summary_file], False)
+
+    assert table.to_summary() == expected
+    assert instruction_coverage["blackbox"]["a.sol"][2] == \
+        context.result_service.get_instructions_coverage(
+            "blackbox", [type("Contract", (), {"file": "a.sol"})()])["a.sol"][2]
+
+
+def test_merged_summaries_add_the_executions_of_every_experiment(context):
+    summary_files = [_summarize(context, "first"), _summarize(context, "second")]
+
+    table, _, skipped_files = context.metrics_service.merge_summaries(summary_files, False)
+
+    assert skipped_files == {}
+    metrics = table.get("blackbox", "a.sol")
+    assert metrics.execution_count == 3
+    assert metrics.detections == {"reentrancy": 2, "delegate": 1}
+    assert list(metrics.weaknesses) == [
+        (["reentrancy"], {"reentrancy": 30}), ([], {}), (["reentrancy", "delegate"], {"reentrancy": 12, "delegate": 40})]
+    assert metrics.max_coverage.mean == pytest.approx((21 + 4 + 33) / 40 / 3)
+    assert table.get("greybox", "b.sol").execution_count == 1
+
+
+def test_merged_summaries_in_the_smartian_standard(context):
+    summary_files = [_summarize(context, "first"), _summarize(context, "second")]
+
+    table, _, _ = context.metrics_service.merge_summaries(summary_files, True)
+
+    assert table.get("blackbox", "a.sol").detections == {"RE": 2, "ME": 1}
+    assert table.get("greybox", "b.sol").detections == {"ME": 1}
+    assert list(table.get("greybox", "b.sol").weaknesses) == [(["ME"], {"delegate": 5, "gasless-send": 9})]
+
+
+def test_a_summary_of_the_same_results_is_merged_once(context):
+    summary_file = _summarize(context, "first")
+
+    table, _, skipped_files = context.metrics_service.merge_summaries([summary_file, summary_file], False)
+
+    assert table.get("blackbox", "a.sol").execution_count == 2
+    assert skipped_files == {summary_file: summary_file}
+
+
+def test_a_summary_of_another_version_raises(context):
+    summary_file = _summarize(context, "first")
+    with open(summary_file, 'r') as file:
+        summary = json.load(file)
+    summary["version"] = -1
+    with open(summary_file, 'w') as file:
+        json.dump(summary, file)
+
+    with pytest.raises(ValueError):
+        context.metrics_service.merge_summaries([summary_file], False)
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from aggregator.shared.timeline import MICROSECONDS_PER_SECOND, decode_timestamps, sample_indexes
+
+
+def _scan_indexes(epochs: list, time_frame_in_seconds: int, upper_limit_in_seconds: int) -> list:
+    """the linear scan sample_indexes replaces"""
+    query_time = min(epochs)
+    index = 0
+    indexes = []
+    for _ in range(time_frame_in_seconds, upper_limit_in_seconds + time_frame_in_seconds, time_frame_in_seconds):
+        query_time += time_frame_in_seconds * MICROSECONDS_PER_SECOND
+        index = next((i for i, epoch in enumerate(epochs) if epoch > query_time), index)
+        indexes.append(index)
+    return indexes
+
+
+@pytest.mark.parametrize("sort", [True, False])
+def test_sample_indexes_matches_the_linear_scan(sort):
+    random = np.random.default_rng(7)
+    for _ in range(200):
+        epochs = random.integers(0, 4000, size=random.integers(1, 30)) * MICROSECONDS_PER_SECOND
+        if sort:
+            epochs = np.sort(epochs)
+
+        offsets, indexes = sample_indexes(epochs, 300, 3600)
+
+        assert offsets.tolist() == list(range(300, 3900, 300))
+        assert indexes.tolist() == _scan_indexes(epochs.tolist(), 300, 3600)
+
+
+def test_sample_indexes_keeps_the_last_index_past_the_last_entry():
+    epochs = np.array([0, 10, 20]) * MICROSECONDS_PER_SECOND
+
+    _, indexes = sample_indexes(epochs, 5, 30)
+
+    assert indexes.tolist() == [1, 2, 2, 2, 2, 2]
+
+
+def test_decode_timestamps_with_a_utc_offset():
+    epochs = decode_timestamps(["2023-05-18T10:00:00.5-03:00", "2023-05-18T10:01:00-03:00"])
+
+    expected = datetime(2023, 5, 18, 13, 0, 0, 500000) - datetime(1970, 1, 1)
+    assert epochs.dtype == np.int64
+    assert epochs.tolist() == [
+        expected // timedelta(microseconds=1),
+        (expected + timedelta(seconds=59.5)) // timedelta(microseconds=1),
+    ]
+
+
+def test_decode_timestamps_in_utc_and_without_offset_agree():
+    assert decode_timestamps(["2023-05-18T13:00:00Z"]).tolist() == \
+        decode_timestamps(["2023-05-18T13:00:00"]).tolist()
+
+
+def test_decode_timestamps_with_different_offsets():
+    epochs = decode_timestamps(["2023-05-18T10:00:00-03:00", "2023-05-18T15:00:00+02:00"])
+
+    assert epochs[0] == epochs[1]
+
+
+def test_decode_no_timestamps():
+    assert len(decode_timestamps([])) == 0
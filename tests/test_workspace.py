@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+
+from aggregator.shared import workspace
+from aggregator.shared.workspace import Workspace
+
+
+def _write(path, content: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        file.write(content)
+
+
+def _read(path) -> str:
+    with open(path, 'r') as file:
+        return file.read()
+
+
+def test_publish_replaces_the_files(tmp_path):
+    _write(tmp_path / "out" / "report.txt", "former")
+
+    with Workspace(str(tmp_path / ".temp")) as current:
+        _write(os.path.join(current.path, "report.txt"), "new")
+        _write(os.path.join(current.path, "other.txt"), "other")
+        current.publish(str(tmp_path / "out"), ["report.txt"])
+
+    assert sorted(os.listdir(tmp_path / "out")) == ["report.txt"]
+    assert _read(tmp_path / "out" / "report.txt") == "new"
+    assert os.listdir(tmp_path / ".temp") == []
+
+
+@pytest.mark.parametrize("exchange", [True, False])
+def test_publish_replaces_a_folder(tmp_path, monkeypatch, exchange):
+    if not exchange:
+        monkeypatch.setattr(workspace, "_exchange", lambda source, target: False)
+    _write(tmp_path / "out" / "compiled" / "former.npy", "former")
+
+    with Workspace(str(tmp_path / ".temp")) as current:
+        _write(os.path.join(current.path, "compiled", "new.npy"), "new")
+        current.publish(str(tmp_path / "out"))
+
+    assert os.listdir(tmp_path / "out" / "compiled") == ["new.npy"]
+    assert os.listdir(tmp_path / ".temp") == []
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="renameat2 is only available on Linux")
+def test_exchange_swaps_two_folders(tmp_path):
+    _write(tmp_path / "a" / "a.txt", "a")
+    _write(tmp_path / "b" / "b.txt", "b")
+
+    if not workspace._exchange(str(tmp_path / "a"), str(tmp_path / "b")):
+        pytest.skip("the file system can't exchange folders")
+
+    assert os.listdir(tmp_path / "a") == ["b.txt"]
+    assert os.listdir(tmp_path / "b") == ["a.txt"]